@@ -0,0 +1,211 @@
+"""Микробенчмарки горячего пути: check_response, parse_status и diff.
+
+Бенчмарк cycle прогоняет весь цикл опроса одного аккаунта через
+источник статусов и получателя уведомлений в памяти, без сети.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_hot_path.py
+    python benchmarks/bench_hot_path.py --sizes 1 1000 --fail-on-regression
+
+Результаты дописываются строкой в benchmarks/results.jsonl и
+сравниваются с предыдущим запуском.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import homework  # noqa: E402
+from bot.accounts import Account  # noqa: E402
+from bot.state import HomeworkState  # noqa: E402
+from bot.transports import InMemorySink, InMemoryStatusSource  # noqa: E402
+
+SIZES = (1, 10, 100, 1000, 10000, 100000)
+STATUSES = tuple(homework.HOMEWORK_VERDICTS)
+RESULTS_FILE = os.path.join(BASE_DIR, 'benchmarks', 'results.jsonl')
+REGRESSION_THRESHOLD = 0.2
+
+
+def make_payload(size):
+    """Ответ API с size работами."""
+    return {
+        'homeworks': [
+            {
+                'id': number,
+                'homework_name': f'student__hw{number:06d}.zip',
+                'status': STATUSES[number % len(STATUSES)],
+                'reviewer_comment': 'Всё нравится',
+                'date_updated': '2020-02-13T14:40:57Z',
+                'lesson_name': 'Итоговый проект',
+            }
+            for number in range(size)
+        ],
+        'current_date': 1581604970,
+    }
+
+
+def bench_check_response(payload):
+    """Проверка ответа API."""
+    return lambda: homework.check_response(payload)
+
+
+def bench_parse_status(payload):
+    """Текст сообщения для каждой работы."""
+    homeworks = payload['homeworks']
+
+    def run():
+        for item in homeworks:
+            homework.parse_status(item)
+    return run
+
+
+def bench_diff_new(payload):
+    """Поиск изменений, когда все статусы новые."""
+    homeworks = payload['homeworks']
+
+    def run():
+        state = HomeworkState()
+        for item in homeworks:
+            state.update(item)
+    return run
+
+
+def bench_diff_unchanged(payload):
+    """Поиск изменений, когда статусы не изменились."""
+    homeworks = payload['homeworks']
+    state = HomeworkState(history_size=1)
+    for item in homeworks:
+        state.update(item)
+
+    def run():
+        for item in homeworks:
+            state.update(item)
+    return run
+
+
+def bench_cycle(payload):
+    """Цикл опроса аккаунта без изменений статусов."""
+    position = int(time.time()) - 60
+    source = InMemoryStatusSource()
+    source.put('bench', payload['homeworks'])
+    homework.status_source = source
+    sink = InMemorySink(maxlen=1)
+    account = Account('bench', 'token', [])
+    account.load()
+
+    def run():
+        account.cursor.position = position
+        homework.run_cycle(sink, account)
+    return run
+
+
+BENCHMARKS = {
+    'check_response': bench_check_response,
+    'parse_status': bench_parse_status,
+    'diff_new': bench_diff_new,
+    'diff_unchanged': bench_diff_unchanged,
+    'cycle': bench_cycle,
+}
+
+
+def measure(func, repeat):
+    """Лучшее время одного вызова func в секундах."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(sizes, repeat):
+    """Замеры всех бенчмарков для всех размеров."""
+    results = {}
+    for size in sizes:
+        payload = make_payload(size)
+        for name, bench in BENCHMARKS.items():
+            seconds = measure(bench(payload), repeat)
+            results[f'{name}[{size}]'] = seconds
+            print(
+                f'{name:>16} {size:>7}: {seconds * 1e6:12.2f} мкс '
+                f'({seconds / size * 1e9:8.1f} нс на работу)'
+            )
+    return results
+
+
+def git_revision():
+    """Текущий коммит или None вне git."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BASE_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(path):
+    """Последний сохранённый запуск или None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        lines = [line for line in file if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def compare(previous, results, threshold):
+    """Названия замеров, которые стали медленнее больше чем на threshold."""
+    regressions = []
+    for key, seconds in results.items():
+        before = previous['results'].get(key)
+        if not before:
+            continue
+        change = seconds / before - 1
+        marker = ''
+        if change > threshold:
+            regressions.append(key)
+            marker = '  <-- регрессия'
+        print(f'{key:>24}: {change:+7.1%}{marker}')
+    return regressions
+
+
+def main():
+    """Запускает бенчмарки, сохраняет и сравнивает результаты."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument(
+        '--threshold', type=float, default=REGRESSION_THRESHOLD
+    )
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    previous = load_previous(args.output)
+    results = run(args.sizes, args.repeat)
+    regressions = []
+    if previous:
+        print(f'Сравнение с запуском {previous.get("revision")}:')
+        regressions = compare(previous, results, args.threshold)
+    if not args.no_save:
+        record = {
+            'timestamp': int(time.time()),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results,
+        }
+        with open(args.output, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + '\n')
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Аккаунты Практикума, которые опрашивает бот."""
+import json
+import os
+
+from bot.cursor import PollCursor
+from bot.state import HomeworkState
+
+
+class Account:
+    """Токен Практикума, его подписчики, состояние и курсор опроса.
+
+    subscribers=None означает основной чат и TELEGRAM_SUBSCRIBERS.
+    """
+
+    def __init__(self, name, token, subscribers=None, state_file=None):
+        """Аккаунт name с токеном token; state_file — файл его состояния."""
+        self.name = name
+        self.token = token
+        self.subscribers = subscribers
+        self.state = HomeworkState(state_file)
+        self.cursor = None
+        self.deferred = 0
+        self.quarantined = False
+
+    @property
+    def headers(self):
+        """Заголовки запроса к API с токеном аккаунта."""
+        return {'Authorization': f'OAuth {self.token}'}
+
+    def load(self):
+        """Восстанавливает состояние и курсор из файла."""
+        self.state.load()
+        self.cursor = PollCursor(self.state.cursor)
+
+    def is_active(self):
+        """Есть ли у аккаунта работы на проверке."""
+        return any(
+            homework.get('status') == 'reviewing'
+            for homework in self.state.snapshot()
+        )
+
+
+def account_state_file(state_file, name):
+    """Файл состояния дополнительного аккаунта рядом с основным."""
+    if not state_file:
+        return None
+    root, ext = os.path.splitext(state_file)
+    return f'{root}-{name}{ext or ".json"}'
+
+
+def load_accounts(path, parse_subscribers, state_file=None):
+    """Читает дополнительные аккаунты из JSON-файла.
+
+    Формат: [{"name": "...", "token": "...", "subscribers": "1:en,2"}].
+    """
+    with open(path, encoding='utf-8') as file:
+        items = json.load(file)
+    accounts = []
+    for item in items:
+        subscribers = item.get('subscribers', '')
+        if isinstance(subscribers, list):
+            subscribers = ','.join(subscribers)
+        accounts.append(Account(
+            item['name'],
+            item['token'],
+            parse_subscribers(subscribers),
+            account_state_file(state_file, item['name'])
+        ))
+    return accounts
@@ -0,0 +1,73 @@
+"""Общие результаты одинаковых запросов к API."""
+import time
+from threading import Event, Lock
+
+COALESCE_TTL = 5
+
+
+class _Call:
+    """Запрос, который выполняется прямо сейчас."""
+
+    def __init__(self):
+        self.done = Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Кэш с коротким ttl и одним одновременным запросом на ключ.
+
+    Пока первый вызов get загружает значение, остальные вызовы с тем же
+    ключом ждут и получают его результат. Успешный результат ещё ttl
+    секунд отдаётся из кэша, ошибки не кэшируются.
+    """
+
+    def __init__(self, ttl=COALESCE_TTL):
+        """Успешные результаты хранятся ttl секунд."""
+        self.ttl = ttl
+        self._lock = Lock()
+        self._results = {}
+        self._calls = {}
+        self.loads = 0
+        self.shared = 0
+
+    def get(self, key, load):
+        """Значение по ключу; load() вызывается только при промахе."""
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.shared += 1
+                return cached[1]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            with self._lock:
+                self.shared += 1
+            if call.error is not None:
+                raise call.error
+            return call.value
+        return self._load(key, call, load)
+
+    def _load(self, key, call, load):
+        try:
+            call.value = load()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                self.loads += 1
+                del self._calls[key]
+                now = time.monotonic()
+                if call.error is None:
+                    self._results[key] = (now + self.ttl, call.value)
+                for stale in [
+                    item for item, (expires, _) in self._results.items()
+                    if expires <= now
+                ]:
+                    del self._results[stale]
+            call.done.set()
+        return call.value
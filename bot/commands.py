@@ -0,0 +1,99 @@
+"""Ответы на команды пользователей из состояния бота."""
+import logging
+from threading import Event, Thread
+
+logger = logging.getLogger(__name__)
+
+POLL_TIMEOUT = 30
+ERROR_DELAY = 5
+HISTORY_LIMIT = 10
+
+
+class CommandListener(Thread):
+    """Получает команды через getUpdates и отвечает из HomeworkState.
+
+    API Практикума при этом не вызывается. find_states(chat_id)
+    возвращает состояния аккаунтов, на которые подписан чат; чатам без
+    подписки бот не отвечает.
+    """
+
+    def __init__(self, bot, find_states, describe,
+                 poll_timeout=POLL_TIMEOUT):
+        """Состояния чата ищет find_states, вердикт по статусу — describe."""
+        super().__init__(name='command-listener', daemon=True)
+        self.bot = bot
+        self.find_states = find_states
+        self.describe = describe
+        self.poll_timeout = poll_timeout
+        self.offset = None
+        self.stopped = Event()
+        self.handlers = {
+            '/status': self.reply_status,
+            '/history': self.reply_history,
+        }
+
+    def run(self):
+        """Цикл long polling до остановки."""
+        while not self.stopped.is_set():
+            try:
+                updates = self.bot.get_updates(
+                    offset=self.offset, timeout=self.poll_timeout
+                )
+            except Exception as error:
+                logger.error(f'Сбой получения команд: {error}')
+                self.stopped.wait(ERROR_DELAY)
+                continue
+            for update in updates:
+                self.offset = update.update_id + 1
+                self.handle(update.message)
+
+    def stop(self):
+        """Останавливает получение команд."""
+        self.stopped.set()
+
+    def handle(self, message):
+        """Отвечает на команду из сообщения."""
+        if message is None or not message.text:
+            return
+        states = self.find_states(str(message.chat_id))
+        if not states:
+            logger.warning(f'Команда из чужого чата {message.chat_id}')
+            return
+        command = message.text.split()[0].split('@')[0]
+        handler = self.handlers.get(command)
+        if handler is None:
+            return
+        try:
+            self.bot.send_message(
+                chat_id=message.chat_id, text=handler(states)
+            )
+        except Exception as error:
+            logger.error(f'Не удалось ответить на {command}: {error}')
+
+    def reply_status(self, states):
+        """Текущие статусы работ."""
+        homeworks = [
+            homework for state in states for homework in state.snapshot()
+        ]
+        if not homeworks:
+            return 'Статусов работ пока нет.'
+        lines = [
+            f'"{homework["homework_name"]}": {self.describe(homework)}'
+            for homework in homeworks
+        ]
+        return '\n'.join(['Текущие статусы:', *lines])
+
+    def reply_history(self, states):
+        """Последние изменения статусов."""
+        transitions = sorted(
+            (item for state in states for item in state.history()),
+            key=lambda item: item.seen_at, reverse=True
+        )[:HISTORY_LIMIT]
+        if not transitions:
+            return 'Изменений статусов пока не было.'
+        lines = [
+            f'{item.new_updated or "—"} "{item.homework_name}": '
+            f'{item.old_status or "—"} → {item.new_status}'
+            for item in transitions
+        ]
+        return '\n'.join(['Последние изменения:', *lines])
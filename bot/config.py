@@ -0,0 +1,62 @@
+"""Перечитывание файла настроек без перезапуска бота."""
+import json
+import logging
+import os
+from threading import Event, Thread
+
+logger = logging.getLogger(__name__)
+
+CONFIG_POLL_INTERVAL = 5
+
+
+def load_config(path):
+    """Читает настройки из JSON-файла."""
+    with open(path, encoding='utf-8') as file:
+        config = json.load(file)
+    if not isinstance(config, dict):
+        raise TypeError(f'В {path} ожидался объект, пришёл {type(config)}')
+    return config
+
+
+class ConfigWatcher(Thread):
+    """Следит за временем изменения файла и применяет новые настройки.
+
+    Если файл не читается или apply выбрасывает исключение, остаются
+    прежние настройки.
+    """
+
+    def __init__(self, path, apply, interval=CONFIG_POLL_INTERVAL):
+        """apply(config) вызывается при каждом изменении файла path."""
+        super().__init__(name='config-watcher', daemon=True)
+        self.path = path
+        self.apply = apply
+        self.interval = interval
+        self.mtime = None
+        self.stopped = Event()
+
+    def check(self):
+        """Применяет файл, если он изменился. Возвращает True при успехе."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as error:
+            logger.error(f'Файл настроек {self.path} недоступен: {error}')
+            return False
+        if mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        try:
+            self.apply(load_config(self.path))
+        except Exception as error:
+            logger.error(f'Настройки из {self.path} не применены: {error}')
+            return False
+        logger.info(f'Применены настройки из {self.path}')
+        return True
+
+    def run(self):
+        """Проверяет файл каждые interval секунд."""
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """Останавливает слежение за файлом."""
+        self.stopped.set()
@@ -0,0 +1,45 @@
+"""Курсор from_date для запросов к API домашки."""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CURSOR_OVERLAP = 60
+MAX_BACKFILL = 7 * 24 * 60 * 60
+
+
+class PollCursor:
+    """Позиция, с которой запрашиваются изменения статусов.
+
+    Запрос идёт с небольшим перекрытием, чтобы не потерять изменения на
+    границе окна. После простоя бот догоняет пропущенное, но не дальше
+    max_backfill секунд назад. Повторы отсекает HomeworkState.
+    """
+
+    def __init__(self, position=None, overlap=CURSOR_OVERLAP,
+                 max_backfill=MAX_BACKFILL):
+        """Без position опрос начинается с текущего момента."""
+        self.position = int(position or time.time())
+        self.overlap = overlap
+        self.max_backfill = max_backfill
+
+    def from_date(self, now=None):
+        """Значение from_date для следующего запроса."""
+        now = int(now or time.time())
+        start = self.position - self.overlap
+        oldest = now - self.max_backfill
+        if start < oldest:
+            logger.warning(
+                f'Пропуск {now - start} с больше допустимого, '
+                f'догоняем только {self.max_backfill} с'
+            )
+            start = oldest
+        return max(start, 0)
+
+    def advance(self, response):
+        """Сдвигает курсор на current_date из успешного ответа."""
+        current_date = response.get('current_date')
+        if not isinstance(current_date, int) or current_date <= self.position:
+            return False
+        self.position = current_date
+        return True
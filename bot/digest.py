@@ -0,0 +1,148 @@
+"""Сводки изменений статусов по расписанию."""
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from threading import Lock
+
+from bot.state import Transition, read_json, write_json
+
+DIGEST_PERIODS = {
+    'hourly': 60 * 60,
+    'daily': 24 * 60 * 60,
+}
+
+DIGEST_TITLES = {
+    'ru': 'Сводка изменений статусов:',
+    'en': 'Review status digest:',
+}
+
+DURATION_FORMATS = {
+    'ru': 'проверка заняла {hours} ч {minutes} мин',
+    'en': 'review took {hours} h {minutes} min',
+}
+
+
+def digest_file(state_file):
+    """Файл сводок рядом с файлом состояния.
+
+    Файлы аккаунтов называются <имя>-<аккаунт>, поэтому через точку
+    имя не совпадёт ни с одним из них.
+    """
+    if not state_file:
+        return None
+    root, ext = os.path.splitext(state_file)
+    return f'{root}.digests{ext or ".json"}'
+
+
+def parse_date(value):
+    """Разбирает дату из API вида 2020-02-13T14:40:57Z."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+    except ValueError:
+        return None
+
+
+def review_duration(transition):
+    """Сколько секунд работа была на проверке или None."""
+    if transition.old_status != 'reviewing':
+        return None
+    started = parse_date(transition.old_updated)
+    finished = parse_date(transition.new_updated)
+    if started is None or finished is None:
+        return None
+    return max(0, int((finished - started).total_seconds()))
+
+
+def render_digest(transitions, locale, verdict):
+    """Текст сводки. verdict(locale, status) возвращает вердикт."""
+    default_locale = next(iter(DIGEST_TITLES))
+    lines = [DIGEST_TITLES.get(locale, DIGEST_TITLES[default_locale])]
+    duration_format = DURATION_FORMATS.get(
+        locale, DURATION_FORMATS[default_locale]
+    )
+    for transition in transitions:
+        line = (
+            f'"{transition.homework_name}": '
+            f'{verdict(locale, transition.new_status)}'
+        )
+        duration = review_duration(transition)
+        if duration is not None:
+            hours, seconds = divmod(duration, 60 * 60)
+            line += ' (' + duration_format.format(
+                hours=hours, minutes=seconds // 60
+            ) + ')'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+class DigestCollector:
+    """Копит изменения для подписчиков, выбравших сводку.
+
+    Если задан path, накопленные изменения и время последней сводки
+    переживают перезапуск бота.
+    """
+
+    def __init__(self, path=None):
+        """В файле path сводки хранятся между перезапусками."""
+        self.path = path
+        self._lock = Lock()
+        self._pending = defaultdict(list)
+        self._last_sent = {}
+
+    def add(self, subscribers, transition):
+        """Добавляет изменение в сводки подписчиков."""
+        with self._lock:
+            for subscriber in subscribers:
+                if subscriber.digest in DIGEST_PERIODS:
+                    self._pending[subscriber.chat_id].append(transition)
+
+    def due(self, subscribers, now=None):
+        """Возвращает пары (подписчик, изменения), которым пора сводка."""
+        if now is None:
+            now = time.time()
+        ready = []
+        with self._lock:
+            for subscriber in subscribers:
+                period = DIGEST_PERIODS.get(subscriber.digest)
+                if period is None:
+                    continue
+                last_sent = self._last_sent.setdefault(
+                    subscriber.chat_id, now
+                )
+                if now - last_sent < period:
+                    continue
+                self._last_sent[subscriber.chat_id] = now
+                transitions = self._pending.pop(subscriber.chat_id, [])
+                if transitions:
+                    ready.append((subscriber, transitions))
+        return ready
+
+    def save(self):
+        """Сохраняет накопленные изменения в файл, если он задан."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'pending': {
+                    chat_id: [item._asdict() for item in transitions]
+                    for chat_id, transitions in self._pending.items()
+                },
+                'last_sent': dict(self._last_sent),
+            }
+        write_json(self.path, data)
+
+    def load(self):
+        """Загружает накопленные изменения из файла, если он есть."""
+        data = read_json(self.path)
+        if data is None:
+            return
+        with self._lock:
+            self._pending.clear()
+            for chat_id, transitions in data.get('pending', {}).items():
+                self._pending[chat_id] = [
+                    Transition(**item) for item in transitions
+                ]
+            self._last_sent = dict(data.get('last_sent', {}))
@@ -0,0 +1,92 @@
+"""Группировка ошибок, чтобы не засыпать чат одинаковыми сообщениями."""
+import time
+from threading import Lock
+
+ERROR_TTL = 60 * 60
+SUMMARY_PERIOD = 60 * 60
+SAMPLE_LENGTH = 200
+
+
+def format_time(moment):
+    """Время в сводке ошибок."""
+    return time.strftime('%H:%M:%S', time.localtime(moment))
+
+
+class ErrorRecord:
+    """Счётчики одной группы ошибок за период сводки."""
+
+    def __init__(self, now):
+        """Время now — момент первой ошибки группы."""
+        self.first_seen = now
+        self.last_seen = now
+        self.count = 0
+        self.suppressed = 0
+        self.sample = ''
+
+    def describe(self):
+        """Строка сводки: повторы, всего, время и пример ошибки."""
+        return (
+            f'{self.suppressed} повт. (всего {self.count}, '
+            f'{format_time(self.first_seen)}–{format_time(self.last_seen)})'
+            f': {self.sample}'
+        )
+
+
+class ErrorAggregator:
+    """Ошибки группируются по типу исключения и источнику.
+
+    Источник — имя аккаунта или main для ошибок основного цикла.
+
+    О первой ошибке группы сообщается сразу. Повторы в течение ttl
+    только считаются и попадают в сводку раз в summary_period. После
+    resolve та же ошибка снова считается новой.
+    """
+
+    def __init__(self, ttl=ERROR_TTL, summary_period=SUMMARY_PERIOD):
+        """Повторы скрываются ttl секунд, сводка — раз в summary_period."""
+        self.ttl = ttl
+        self.summary_period = summary_period
+        self._lock = Lock()
+        self._notified = {}
+        self._records = {}
+        self._last_summary = time.time()
+
+    def record(self, error, source, now=None):
+        """Учитывает ошибку, возвращает True, если о ней нужно сообщить."""
+        now = now or time.time()
+        key = (type(error).__name__, source)
+        with self._lock:
+            record = self._records.setdefault(key, ErrorRecord(now))
+            record.count += 1
+            record.last_seen = now
+            record.sample = str(error)[:SAMPLE_LENGTH]
+            notified_at = self._notified.get(key)
+            if notified_at is not None and now - notified_at < self.ttl:
+                record.suppressed += 1
+                return False
+            self._notified[key] = now
+            return True
+
+    def resolve(self, source):
+        """Отмечает, что источник снова работает без ошибок."""
+        with self._lock:
+            for key in [key for key in self._notified if key[1] == source]:
+                del self._notified[key]
+
+    def summary(self, now=None):
+        """Текст сводки о пропущенных повторах, если пора её отправить."""
+        now = now or time.time()
+        with self._lock:
+            if now - self._last_summary < self.summary_period:
+                return None
+            self._last_summary = now
+            records, self._records = self._records, {}
+        lines = [
+            f'{name} ({source}): {record.describe()}'
+            for (name, source), record in sorted(records.items())
+            if record.suppressed
+        ]
+        if not lines:
+            return None
+        minutes = self.summary_period // 60
+        return '\n'.join([f'Повторы ошибок за {minutes} мин:', *lines])
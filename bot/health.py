@@ -0,0 +1,150 @@
+"""HTTP-проверка здоровья бота и сторож основного цикла."""
+import json
+import logging
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+
+logger = logging.getLogger(__name__)
+
+WATCHDOG_INTERVAL = 5
+
+
+class Heartbeat:
+    """Отметки о работе основного цикла.
+
+    Перед каждым этапом цикл сообщает, сколько секунд ему нужно.
+    Если этап не закончился вовремя, цикл считается зависшим.
+    """
+
+    def __init__(self):
+        """Пока цикл не вошёл ни в один этап, он не считается зависшим."""
+        self._lock = Lock()
+        self.beats = {}
+        self.stage = None
+        self.deadline = None
+        self.stalled = False
+
+    def beat(self, name):
+        """Запоминает время успешного события."""
+        with self._lock:
+            self.beats[name] = time.time()
+
+    def enter(self, stage, budget):
+        """Начало этапа, который должен уложиться в budget секунд."""
+        with self._lock:
+            self.stage = stage
+            self.deadline = time.time() + budget
+            self.stalled = False
+
+    def progress(self, budget):
+        """Этап продвинулся: следующий шаг должен уложиться в budget."""
+        with self._lock:
+            self.deadline = time.time() + budget
+            self.stalled = False
+
+    def since(self, name, now=None):
+        """Сколько секунд прошло с события или None."""
+        moment = self.beats.get(name)
+        if moment is None:
+            return None
+        return round((now or time.time()) - moment, 3)
+
+    def overdue(self, now=None):
+        """На сколько секунд текущий этап вышел за свой бюджет."""
+        if self.deadline is None:
+            return 0
+        return max(0, (now or time.time()) - self.deadline)
+
+    def report(self):
+        """Состояние цикла для проверки здоровья."""
+        now = time.time()
+        return {
+            'status': 'stalled' if self.overdue(now) else 'ok',
+            'stage': self.stage,
+            'overdue': round(self.overdue(now), 3),
+            'since_last_poll': self.since('poll', now),
+            'since_last_send': self.since('send', now),
+        }
+
+
+class Watchdog(Thread):
+    """Проверяет, что основной цикл не завис."""
+
+    def __init__(self, heartbeat, on_stall, interval=WATCHDOG_INTERVAL):
+        """on_stall(stage) вызывается, когда этап выходит за бюджет."""
+        super().__init__(name='watchdog', daemon=True)
+        self.heartbeat = heartbeat
+        self.on_stall = on_stall
+        self.interval = interval
+        self.stopped = Event()
+
+    def run(self):
+        """Проверяет бюджет текущего этапа каждые interval секунд."""
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Сообщает о зависании один раз на этап."""
+        overdue = self.heartbeat.overdue()
+        if not overdue or self.heartbeat.stalled:
+            return
+        self.heartbeat.stalled = True
+        logger.critical(
+            f'Основной цикл завис на этапе {self.heartbeat.stage}: '
+            f'превышение {overdue:.0f} с'
+        )
+        self.on_stall(self.heartbeat.stage)
+
+    def stop(self):
+        """Останавливает сторожа."""
+        self.stopped.set()
+
+
+class HealthServer(Thread):
+    """Небольшой HTTP-сервер с JSON-ответами по адресам из routes.
+
+    Обработчик маршрута возвращает словарь. Если в нём status не ok,
+    сервер отвечает кодом 503.
+    """
+
+    def __init__(self, port, routes, host='0.0.0.0'):
+        """В routes адресам сопоставлены функции, возвращающие словарь."""
+        super().__init__(name='health-server', daemon=True)
+        self.routes = routes
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+
+    def _handler(self):
+        routes = self.routes
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                route = routes.get(self.path.split('?')[0])
+                if route is None:
+                    self.send_error(HTTPStatus.NOT_FOUND)
+                    return
+                payload = route()
+                code = HTTPStatus.OK
+                if payload.get('status', 'ok') != 'ok':
+                    code = HTTPStatus.SERVICE_UNAVAILABLE
+                body = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def run(self):
+        """Обслуживает запросы до остановки."""
+        self.server.serve_forever()
+
+    def stop(self):
+        """Останавливает сервер."""
+        self.server.shutdown()
+        self.server.server_close()
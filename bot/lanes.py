@@ -0,0 +1,102 @@
+"""Очереди доставки с разными приоритетами."""
+import logging
+import time
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+
+logger = logging.getLogger(__name__)
+
+LANE_SIZE = 1000
+LANE_DRAIN_TIMEOUT = 10
+
+
+class RateLimiter:
+    """Ограничение частоты: rate событий в секунду, до burst подряд."""
+
+    def __init__(self, rate, burst=1):
+        """Значения rate и burst должны быть положительными."""
+        if rate <= 0 or burst <= 0:
+            raise ValueError(
+                f'Лимит должен быть положительным: rate={rate}, burst={burst}'
+            )
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = Lock()
+
+    def delay(self):
+        """Забирает токен, возвращает сколько секунд нужно подождать."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+
+class DeliveryLane(Thread):
+    """Отдельный поток с собственной очередью отправок.
+
+    У каждой полосы своя очередь и свой лимит, поэтому поток сообщений
+    одного вида не задерживает другой.
+    """
+
+    def __init__(self, name, limiter=None, maxsize=LANE_SIZE):
+        """Без limiter отправки идут без ограничения частоты."""
+        super().__init__(name=f'lane-{name}', daemon=True)
+        self.limiter = limiter
+        self.queue = Queue(maxsize=maxsize)
+        self.stopped = Event()
+        self.dropped = 0
+
+    def submit(self, job):
+        """Ставит отправку в очередь, возвращает False при переполнении."""
+        try:
+            self.queue.put_nowait(job)
+        except Full:
+            self.dropped += 1
+            logger.error(f'Очередь {self.name} переполнена')
+            return False
+        return True
+
+    def run(self):
+        """Выполняет отправки по очереди с учётом лимита."""
+        while not self.stopped.is_set():
+            try:
+                job = self.queue.get(timeout=1)
+            except Empty:
+                continue
+            try:
+                if self.limiter is not None:
+                    self.stopped.wait(self.limiter.delay())
+                job()
+            except Exception as error:
+                logger.error(f'Сбой отправки в {self.name}: {error}')
+            finally:
+                self.queue.task_done()
+
+    def drain(self, timeout=LANE_DRAIN_TIMEOUT):
+        """Ждёт до timeout секунд, пока очередь не опустеет.
+
+        Возвращает True, если все отправки выполнены.
+        """
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                left = deadline - time.monotonic()
+                if left <= 0 or not self.is_alive():
+                    break
+                self.queue.all_tasks_done.wait(left)
+            pending = self.queue.unfinished_tasks
+        if pending:
+            logger.error(f'В очереди {self.name} не отправлено: {pending}')
+        return not pending
+
+    def stop(self):
+        """Останавливает полосу после текущей отправки."""
+        self.stopped.set()
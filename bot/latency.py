@@ -0,0 +1,92 @@
+"""Задержка от изменения статуса ревьюером до доставки сообщения."""
+import math
+from collections import defaultdict, deque
+from datetime import timezone
+from threading import Lock
+
+from bot.digest import parse_date
+
+LATENCY_WINDOW = 1000
+STAGES = ('poll_wait', 'processing', 'queueing', 'send', 'total')
+PERCENTILES = (50, 95, 99)
+
+
+def api_timestamp(value):
+    """Переводит дату из API в unix-время или возвращает None."""
+    moment = parse_date(value)
+    if moment is None:
+        return None
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+
+def percentile(values, rank):
+    """Перцентиль по методу ближайшего ранга для отсортированных values."""
+    index = max(0, math.ceil(rank / 100 * len(values)) - 1)
+    return values[index]
+
+
+def summarize(values):
+    """p50/p95/p99 и число замеров."""
+    values = sorted(values)
+    if not values:
+        return {'count': 0}
+    summary = {
+        f'p{rank}': round(percentile(values, rank), 3)
+        for rank in PERCENTILES
+    }
+    summary['count'] = len(values)
+    return summary
+
+
+class LatencyTracker:
+    """Последние замеры задержек по аккаунтам и этапам.
+
+    Этапы: poll_wait — от date_updated до получения ответа API,
+    processing — разбор и подготовка сообщения, queueing — ожидание в
+    очереди доставки, send — отправка в Telegram, total — весь путь.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        """Перцентили считаются по последним window замерам."""
+        self.window = window
+        self._lock = Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+
+    def observe(self, account, stage, seconds):
+        """Добавляет замер этапа."""
+        with self._lock:
+            self._samples[account, stage].append(max(0.0, seconds))
+
+    def observe_delivery(self, marks, started, sent):
+        """Раскладывает путь одного сообщения по этапам.
+
+        marks — отметки времени из process_homeworks и очереди доставки.
+        """
+        account = marks.get('account', 'default')
+        updated = marks.get('updated')
+        fetched = marks['fetched']
+        queued = marks.get('queued', started)
+        if updated is not None:
+            self.observe(account, 'poll_wait', fetched - updated)
+            self.observe(account, 'total', sent - updated)
+        self.observe(account, 'processing', queued - fetched)
+        self.observe(account, 'queueing', started - queued)
+        self.observe(account, 'send', sent - started)
+
+    def report(self):
+        """Перцентили по этапам и по этапам каждого аккаунта."""
+        with self._lock:
+            samples = {
+                key: list(values) for key, values in self._samples.items()
+            }
+        by_stage = defaultdict(list)
+        by_account = defaultdict(dict)
+        for (account, stage), values in samples.items():
+            by_stage[stage].extend(values)
+            by_account[account][stage] = summarize(values)
+        return {
+            'by_stage': {
+                stage: summarize(by_stage[stage]) for stage in STAGES
+            },
+            'by_account': dict(by_account),
+        }
@@ -0,0 +1,33 @@
+"""Проверка токенов перед запуском основного цикла."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+PREFLIGHT_WORKERS = 4
+
+
+def run_check(name, check):
+    """True/False от проверки или None, если проверить не удалось."""
+    try:
+        return bool(check())
+    except Exception as error:
+        logger.warning(f'Не удалось проверить {name}: {error}')
+        return None
+
+
+def run_preflight(checks, max_workers=PREFLIGHT_WORKERS):
+    """Выполняет проверки параллельно, не больше max_workers сразу.
+
+    checks — словарь имя -> функция без аргументов. Функция возвращает
+    False для недействительных данных; исключение означает, что ответ
+    неизвестен, и такие данные не отбраковываются.
+    """
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix='preflight'
+    ) as executor:
+        futures = {
+            name: executor.submit(run_check, name, check)
+            for name, check in checks.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,113 @@
+"""Опрос аккаунтов в пределах бюджета цикла."""
+import logging
+import time
+from concurrent.futures import TimeoutError, as_completed
+
+logger = logging.getLogger(__name__)
+
+CYCLE_BUDGET_SHARE = 0.5
+MAX_DEFERRALS = 3
+
+
+class CycleScheduler:
+    """Решает, какие аккаунты опрашивать в этом цикле.
+
+    Сначала опрашиваются аккаунты с работами на проверке и дольше всех
+    отложенные. Когда бюджет цикла исчерпан, остальные откладываются,
+    но не больше max_deferrals циклов подряд.
+    """
+
+    def __init__(self, max_deferrals=MAX_DEFERRALS):
+        """max_deferrals — сколько циклов подряд аккаунт можно откладывать."""
+        self.max_deferrals = max_deferrals
+        self.overruns = 0
+        self.shed_total = 0
+        self.last_shed = 0
+        self.last_duration = 0
+
+    def plan(self, accounts):
+        """Порядок опроса аккаунтов без карантина."""
+        return sorted(
+            (account for account in accounts if not account.quarantined),
+            key=lambda account: (
+                not self.must_run(account), -account.deferred
+            )
+        )
+
+    def must_run(self, account):
+        """Аккаунт нельзя откладывать."""
+        return account.is_active() or account.deferred >= self.max_deferrals
+
+    def run(self, accounts, poll, budget):
+        """Опрашивает аккаунты, откладывая лишние при перегрузке."""
+        started = time.monotonic()
+        shed = 0
+        for account in self.plan(accounts):
+            overrun = time.monotonic() - started > budget
+            if overrun and not self.must_run(account):
+                account.deferred += 1
+                shed += 1
+                continue
+            poll(account)
+            account.deferred = 0
+        self._finish(time.monotonic() - started, shed, budget)
+        return shed
+
+    def run_pooled(self, accounts, fetch, process, budget, executor):
+        """Опрашивает аккаунты параллельно в пуле потоков executor.
+
+        fetch(account) выполняется в пуле, process(account, future) —
+        в вызывающем потоке по мере готовности результатов. Запросы,
+        которые к концу бюджета ещё не начались, отменяются, если
+        аккаунт можно отложить.
+        """
+        started = time.monotonic()
+        futures = {
+            executor.submit(fetch, account): account
+            for account in self.plan(accounts)
+        }
+        shed = 0
+        done = set()
+        try:
+            for future in as_completed(futures, timeout=budget):
+                done.add(future)
+                self._process(process, futures[future], future)
+        except TimeoutError:
+            for future, account in futures.items():
+                if future in done or self.must_run(account):
+                    continue
+                if future.cancel():
+                    account.deferred += 1
+                    shed += 1
+            for future in as_completed(
+                future for future in futures
+                if future not in done and not future.cancelled()
+            ):
+                self._process(process, futures[future], future)
+        self._finish(time.monotonic() - started, shed, budget)
+        return shed
+
+    @staticmethod
+    def _process(process, account, future):
+        process(account, future)
+        account.deferred = 0
+
+    def _finish(self, duration, shed, budget):
+        self.last_duration = duration
+        self.last_shed = shed
+        self.shed_total += shed
+        if duration > budget:
+            self.overruns += 1
+            logger.warning(
+                f'Цикл занял {duration:.1f} с при бюджете '
+                f'{budget:.1f} с, отложено аккаунтов: {shed}'
+            )
+
+    def report(self):
+        """Счётчики перегрузки для метрик."""
+        return {
+            'overruns': self.overruns,
+            'shed_total': self.shed_total,
+            'last_shed': self.last_shed,
+            'last_duration': round(self.last_duration, 3),
+        }
@@ -0,0 +1,115 @@
+"""Состояние домашних работ, известное боту."""
+import json
+import logging
+import os
+import time
+from collections import deque, namedtuple
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SIZE = 100
+
+Transition = namedtuple(
+    'Transition',
+    ('homework_name', 'old_status', 'new_status',
+     'old_updated', 'new_updated', 'seen_at')
+)
+
+
+def write_json(path, data):
+    """Атомарно записывает data в JSON-файл через временный файл."""
+    payload = json.dumps(data, ensure_ascii=False)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write(payload)
+    os.replace(tmp_path, path)
+
+
+def read_json(path):
+    """Данные из JSON-файла или None, если файла нет или он испорчен."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError) as error:
+        logger.error(f'Не удалось прочитать {path}: {error}')
+        return None
+
+
+def homework_key(homework):
+    """Ключ работы: id из API или имя работы."""
+    return str(homework.get('id', homework.get('homework_name')))
+
+
+class HomeworkState:
+    """Последние статусы работ и история их изменений."""
+
+    def __init__(self, path=None, history_size=HISTORY_SIZE):
+        """Без path состояние живёт только в памяти."""
+        self.path = path
+        self._lock = Lock()
+        self._homeworks = {}
+        self._history = deque(maxlen=history_size)
+        self.cursor = None
+
+    def update(self, homework):
+        """Запоминает статус работы, возвращает переход или None."""
+        key = homework_key(homework)
+        record = {
+            'homework_name': homework.get('homework_name'),
+            'status': homework.get('status'),
+            'date_updated': homework.get('date_updated'),
+        }
+        with self._lock:
+            previous = self._homeworks.get(key, {})
+            if previous.get('status') == record['status']:
+                return None
+            self._homeworks[key] = record
+            transition = Transition(
+                record['homework_name'],
+                previous.get('status'),
+                record['status'],
+                previous.get('date_updated'),
+                record['date_updated'],
+                time.time()
+            )
+            self._history.append(transition)
+        return transition
+
+    def snapshot(self):
+        """Возвращает копию последних статусов работ."""
+        with self._lock:
+            return [dict(record) for record in self._homeworks.values()]
+
+    def history(self, limit=None):
+        """Возвращает последние переходы, начиная с самого нового."""
+        with self._lock:
+            transitions = list(reversed(self._history))
+        return transitions[:limit]
+
+    def save(self):
+        """Сохраняет состояние в файл, если он задан."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'homeworks': dict(self._homeworks),
+                'history': [item._asdict() for item in self._history],
+                'cursor': self.cursor,
+            }
+        write_json(self.path, data)
+
+    def load(self):
+        """Загружает состояние из файла, если он есть."""
+        data = read_json(self.path)
+        if data is None:
+            return
+        with self._lock:
+            self._homeworks = data.get('homeworks', {})
+            self.cursor = data.get('cursor')
+            self._history.clear()
+            self._history.extend(
+                Transition(**item) for item in data.get('history', [])
+            )
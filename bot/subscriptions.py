@@ -0,0 +1,106 @@
+"""Подписчики и рассылка уведомлений по нескольким чатам."""
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 8
+
+Subscriber = namedtuple(
+    'Subscriber', ('chat_id', 'locale', 'digest'), defaults=(None,)
+)
+
+
+def parse_subscribers(raw, default_locale):
+    """Разбирает строку вида '123:en,456,789::daily' в список подписчиков.
+
+    После chat_id через двоеточие идут язык и расписание сводки.
+    """
+    subscribers = []
+    for item in raw.split(','):
+        chat_id, locale, digest = (item.strip().split(':') + ['', ''])[:3]
+        if chat_id:
+            subscribers.append(
+                Subscriber(chat_id, locale or default_locale, digest or None)
+            )
+    return subscribers
+
+
+class RecipientStatus:
+    """Результаты доставки одному чату."""
+
+    def __init__(self):
+        """Пока в чат ничего не отправлялось."""
+        self.failures = 0
+        self.total_failures = 0
+        self.last_error = None
+        self.last_success = None
+
+
+class Broadcaster:
+    """Отправляет одно сообщение всем подписчикам параллельно."""
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        """Потоки рассылки создаются при первой рассылке нескольким чатам."""
+        self.max_workers = max_workers
+        self.recipients = {}
+        self._lock = Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='broadcast'
+                )
+            return self._executor
+
+    def _status(self, chat_id):
+        with self._lock:
+            return self.recipients.setdefault(chat_id, RecipientStatus())
+
+    def _deliver(self, send, chat_id, text):
+        status = self._status(chat_id)
+        try:
+            send(chat_id, text)
+        except Exception as error:
+            status.failures += 1
+            status.total_failures += 1
+            status.last_error = str(error)
+            logger.error(
+                f'Сообщение {text} не отправлено в чат {chat_id}: {error}'
+            )
+            return False
+        status.failures = 0
+        status.last_success = time.time()
+        logger.debug(f'Сообщение {text} отправлено в чат {chat_id}')
+        return True
+
+    def broadcast(self, send, subscribers, message, localize):
+        """Рассылает сообщение, возвращает результат по каждому чату.
+
+        Текст готовится один раз на каждую локаль подписчиков.
+        """
+        texts = {}
+        for subscriber in subscribers:
+            if subscriber.locale not in texts:
+                texts[subscriber.locale] = localize(message, subscriber.locale)
+        if len(subscribers) == 1:
+            subscriber = subscribers[0]
+            return {subscriber.chat_id: self._deliver(
+                send, subscriber.chat_id, texts[subscriber.locale]
+            )}
+        futures = {
+            subscriber.chat_id: self._get_executor().submit(
+                self._deliver, send, subscriber.chat_id,
+                texts[subscriber.locale]
+            )
+            for subscriber in subscribers
+        }
+        return {
+            chat_id: future.result() for chat_id, future in futures.items()
+        }
@@ -0,0 +1,101 @@
+"""Шаблоны уведомлений о статусе домашней работы."""
+from collections import OrderedDict
+from threading import Lock
+
+DEFAULT_LOCALE = 'ru'
+RENDER_CACHE_SIZE = 1024
+
+MESSAGE_TEMPLATES = {
+    'ru': 'Изменился статус проверки работы "{homework_name}". {verdict}',
+    'en': 'Review status of "{homework_name}" has changed. {verdict}',
+}
+
+LOCALE_VERDICTS = {
+    'en': {
+        'approved': 'The work has been reviewed: the reviewer liked '
+                    'everything. Hooray!',
+        'reviewing': 'The work has been taken for review.',
+        'rejected': 'The work has been reviewed: the reviewer has comments.'
+    },
+}
+
+
+class StatusMessage(str):
+    """Текст уведомления, который помнит статус и имя работы."""
+
+    def __new__(cls, text, status, homework_name):
+        """Создаёт строку с атрибутами статуса."""
+        message = super().__new__(cls, text)
+        message.status = status
+        message.homework_name = homework_name
+        return message
+
+
+class MessageRenderer:
+    """Заранее собранные шаблоны с кэшем готовых сообщений.
+
+    Для каждой пары (локаль, статус) вердикт подставляется один раз,
+    шаблон хранится как пара строк до и после имени работы.
+    """
+
+    def __init__(self, verdicts, templates=None,
+                 default_locale=DEFAULT_LOCALE,
+                 cache_size=RENDER_CACHE_SIZE):
+        """Вердикты verdicts и шаблоны templates заданы по локалям."""
+        self.default_locale = default_locale
+        self.verdicts = verdicts
+        self.cache_size = cache_size
+        self._lock = Lock()
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._compiled = self._compile(
+            verdicts, templates or MESSAGE_TEMPLATES
+        )
+
+    def _compile(self, verdicts, templates):
+        """Собирает шаблоны по локалям и статусам."""
+        default_verdicts = verdicts[self.default_locale]
+        compiled = {}
+        for locale, template in templates.items():
+            locale_verdicts = verdicts.get(locale, default_verdicts)
+            for status, verdict in locale_verdicts.items():
+                text = template.replace('{verdict}', verdict)
+                head, tail = text.split('{homework_name}', 1)
+                compiled[locale, status] = (head, tail)
+        return compiled
+
+    def verdict(self, locale, status):
+        """Вердикт для статуса на языке подписчика."""
+        verdicts = self.verdicts.get(locale, {})
+        if status in verdicts:
+            return verdicts[status]
+        return self.verdicts[self.default_locale].get(status, status)
+
+    def render(self, locale, status, homework_name):
+        """Возвращает текст уведомления для локали подписчика."""
+        key = (locale, status, homework_name)
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return text
+        parts = self._compiled.get((locale, status))
+        if parts is None:
+            parts = self._compiled.get((self.default_locale, status))
+        if parts is None:
+            raise KeyError(f'Нет шаблона для статуса {status}')
+        text = f'{parts[0]}{homework_name}{parts[1]}'
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = text
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    def localize(self, message, locale):
+        """Переводит уведомление о статусе на язык подписчика."""
+        if not isinstance(message, StatusMessage):
+            return message
+        return self.render(locale, message.status, message.homework_name)
@@ -0,0 +1,206 @@
+"""Спаны этапов цикла в формате OpenTelemetry JSON."""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from queue import Empty, Full, Queue
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = 'homework_bot'
+EXPORT_QUEUE_SIZE = 10000
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL = 1
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def otlp_value(value):
+    """Значение атрибута в виде AnyValue из OTLP JSON."""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class Span:
+    """Один этап цикла: имя, время, атрибуты и результат."""
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        """Время начала спана — момент создания."""
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = STATUS_OK
+        self.message = ''
+
+    def set(self, key, value):
+        """Добавляет атрибут спана."""
+        self.attributes[key] = value
+
+    def to_otlp(self):
+        """Спан в формате OTLP JSON."""
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [
+                {'key': key, 'value': otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            'status': {'code': self.status, 'message': self.message},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+class NoopSpan:
+    """Спан-заглушка, когда трассировка выключена."""
+
+    def set(self, key, value):
+        """Ничего не делает."""
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Tracer:
+    """Создаёт вложенные спаны и передаёт готовые в exporter.
+
+    Без exporter трассировка выключена и почти ничего не стоит.
+    """
+
+    def __init__(self, exporter=None):
+        """Завершённые спаны передаются в exporter.export."""
+        self.exporter = exporter
+        self._local = threading.local()
+
+    def current(self):
+        """Текущий спан потока или заглушка."""
+        stack = self._local.__dict__.get('stack')
+        return stack[-1] if stack else NOOP_SPAN
+
+    def start(self, name, **attributes):
+        """Начинает спан; родителем становится текущий спан потока.
+
+        Спан не становится текущим: его передают в attach, в том числе
+        в других потоках, и завершают через finish.
+        """
+        if self.exporter is None:
+            return NOOP_SPAN
+        parent = self.current()
+        if parent is NOOP_SPAN:
+            return Span(name, os.urandom(16).hex(), attributes=attributes)
+        return Span(name, parent.trace_id, parent.span_id, attributes)
+
+    @contextmanager
+    def attach(self, span):
+        """Делает span текущим в потоке; исключение отмечает его ошибкой."""
+        if span is NOOP_SPAN:
+            yield span
+            return
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(span)
+        try:
+            yield span
+        except Exception as error:
+            span.status = STATUS_ERROR
+            span.message = f'{type(error).__name__}: {error}'
+            raise
+        finally:
+            stack.pop()
+
+    def finish(self, span):
+        """Завершает спан и передаёт его в exporter."""
+        if span is NOOP_SPAN or self.exporter is None:
+            return
+        span.end_ns = time.time_ns()
+        self.exporter.export(span)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Контекст этапа; исключение отмечает спан ошибкой."""
+        span = self.start(name, **attributes)
+        try:
+            with self.attach(span):
+                yield span
+        finally:
+            self.finish(span)
+
+
+class FileSpanExporter(threading.Thread):
+    """Пишет спаны в файл пачками из отдельного потока.
+
+    Каждая строка файла — объект ExportTraceServiceRequest в OTLP JSON,
+    такой файл умеет читать OpenTelemetry Collector.
+    """
+
+    def __init__(self, path, service_name=SERVICE_NAME,
+                 maxsize=EXPORT_QUEUE_SIZE):
+        """Не больше maxsize спанов ждут записи, остальные отбрасываются."""
+        super().__init__(name='span-exporter', daemon=True)
+        self.path = path
+        self.service_name = service_name
+        self.queue = Queue(maxsize=maxsize)
+        self.stopped = threading.Event()
+        self.dropped = 0
+
+    def export(self, span):
+        """Ставит спан в очередь, не блокируя цикл."""
+        try:
+            self.queue.put_nowait(span)
+        except Full:
+            self.dropped += 1
+
+    def _drain(self):
+        spans = []
+        try:
+            spans.append(self.queue.get(timeout=EXPORT_INTERVAL))
+            while len(spans) < EXPORT_BATCH_SIZE:
+                spans.append(self.queue.get_nowait())
+        except Empty:
+            pass
+        return spans
+
+    def write(self, spans):
+        """Записывает пачку спанов одной строкой."""
+        request = {'resourceSpans': [{
+            'resource': {'attributes': [{
+                'key': 'service.name',
+                'value': otlp_value(self.service_name)
+            }]},
+            'scopeSpans': [{
+                'scope': {'name': SERVICE_NAME},
+                'spans': [span.to_otlp() for span in spans],
+            }],
+        }]}
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(request, ensure_ascii=False) + '\n')
+
+    def run(self):
+        """Выгружает спаны до остановки и дописывает остаток очереди."""
+        while not self.stopped.is_set() or not self.queue.empty():
+            spans = self._drain()
+            if not spans:
+                continue
+            try:
+                self.write(spans)
+            except OSError as error:
+                logger.error(f'Не удалось записать спаны: {error}')
+
+    def stop(self):
+        """Останавливает выгрузку после записи очереди."""
+        self.stopped.set()
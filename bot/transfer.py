@@ -0,0 +1,60 @@
+"""Сжатие ответов API и учёт переданных байт."""
+from collections import defaultdict
+from threading import Lock
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+
+
+def response_sizes(response):
+    """Байты по сети и после распаковки для ответа requests."""
+    body = len(getattr(response, 'content', b'') or b'')
+    raw = getattr(response, 'raw', None)
+    if hasattr(raw, 'tell'):
+        wire = raw.tell()
+    else:
+        headers = getattr(response, 'headers', None) or {}
+        wire = int(headers.get('Content-Length', body))
+    return wire or body, body
+
+
+class TransferStats:
+    """Сколько байт и времени на разбор JSON уходит на опросы аккаунтов."""
+
+    def __init__(self):
+        """Счётчики ведутся отдельно по каждому аккаунту."""
+        self._lock = Lock()
+        self._totals = defaultdict(lambda: {
+            'polls': 0, 'wire_bytes': 0, 'body_bytes': 0,
+            'decode_seconds': 0.0,
+        })
+
+    def record(self, account, wire_bytes, body_bytes, decode_seconds):
+        """Добавляет один опрос."""
+        with self._lock:
+            totals = self._totals[account]
+            totals['polls'] += 1
+            totals['wire_bytes'] += wire_bytes
+            totals['body_bytes'] += body_bytes
+            totals['decode_seconds'] += decode_seconds
+
+    def report(self):
+        """Суммы по аккаунтам и степень сжатия."""
+        with self._lock:
+            totals = {
+                account: dict(values)
+                for account, values in self._totals.items()
+            }
+        for values in totals.values():
+            values['compression_ratio'] = round(
+                values['body_bytes'] / values['wire_bytes'], 2
+            ) if values['wire_bytes'] else None
+            values['decode_seconds'] = round(values['decode_seconds'], 6)
+        return totals
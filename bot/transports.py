@@ -0,0 +1,129 @@
+"""Источники статусов и получатели уведомлений.
+
+Получатель по умолчанию — telegram.Bot, он зарегистрирован как
+NotificationSink.
+"""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+
+import telegram
+
+
+class StatusSource(ABC):
+    """Источник ответов в формате API домашки."""
+
+    @abstractmethod
+    def fetch(self, account, from_date):
+        """Ответ API для аккаунта начиная с from_date."""
+
+
+class HttpStatusSource(StatusSource):
+    """Запросы к API Практикума; сам запрос выполняет request."""
+
+    def __init__(self, request):
+        """Функция request(account, from_date) возвращает ответ API."""
+        self.request = request
+
+    def fetch(self, account, from_date):
+        """Ответ API для аккаунта начиная с from_date."""
+        return self.request(account, from_date)
+
+
+class InMemoryStatusSource(StatusSource):
+    """Статусы в памяти процесса для тестов и бенчмарков.
+
+    Как и API, возвращает работы, изменённые не раньше from_date.
+    """
+
+    def __init__(self):
+        """Работы добавляются методом put."""
+        self._lock = threading.Lock()
+        self._homeworks = defaultdict(dict)
+        self.calls = 0
+
+    def put(self, account_name, homeworks, updated_at=None):
+        """Добавляет или обновляет работы аккаунта."""
+        updated_at = int(time.time() if updated_at is None else updated_at)
+        with self._lock:
+            stored = self._homeworks[account_name]
+            for homework in homeworks:
+                key = homework.get('id', homework.get('homework_name'))
+                stored[key] = (updated_at, dict(homework))
+
+    def fetch(self, account, from_date):
+        """Ответ API для аккаунта начиная с from_date."""
+        with self._lock:
+            self.calls += 1
+            stored = list(self._homeworks[account.name].values())
+        return {
+            'homeworks': [
+                homework for updated_at, homework in stored
+                if updated_at >= from_date
+            ],
+            'current_date': int(time.time()),
+        }
+
+
+class NotificationSink(ABC):
+    """Получатель уведомлений с интерфейсом telegram.Bot."""
+
+    @abstractmethod
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        """Отправляет текст text в чат chat_id."""
+
+
+NotificationSink.register(telegram.Bot)
+
+
+class InMemorySink(NotificationSink):
+    """Сохраняет отправленные сообщения в памяти."""
+
+    def __init__(self, maxlen=None):
+        """Хранятся последние maxlen сообщений, без maxlen — все."""
+        self.messages = deque(maxlen=maxlen)
+        self.sent = 0
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        """Запоминает сообщение вместо отправки."""
+        self.messages.append((chat_id, text))
+        self.sent += 1
+
+
+class FileSink(NotificationSink):
+    """Выгружает уведомления в JSONL-файл вместо Telegram."""
+
+    def __init__(self, path):
+        """Файл открывается на дозапись."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        """Дописывает сообщение строкой в файл."""
+        line = json.dumps(
+            {'chat_id': chat_id, 'text': text, 'time': time.time()},
+            ensure_ascii=False
+        )
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        """Закрывает файл."""
+        with self._lock:
+            self._file.close()
+
+
+class QueueSink(NotificationSink):
+    """Кладёт уведомления в очередь для другого потока или процесса."""
+
+    def __init__(self, queue):
+        """Подойдёт любая очередь с методом put."""
+        self.queue = queue
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        """Ставит сообщение в очередь."""
+        self.queue.put((chat_id, text))
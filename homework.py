@@ -1,13 +1,41 @@
 import logging
 import os
+import signal
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 import telegram
 import requests
+from telegram.utils.request import Request
 from sys import stdout
+from urllib.parse import urlsplit
 
 from dotenv import load_dotenv
 
+from bot.accounts import Account, load_accounts
+from bot.coalesce import SingleFlight
+from bot.commands import CommandListener
+from bot.config import ConfigWatcher
+from bot.digest import (
+    DIGEST_PERIODS, DigestCollector, digest_file, render_digest
+)
+from bot.errors import ErrorAggregator
+from bot.health import HealthServer, Heartbeat, Watchdog
+from bot.lanes import DeliveryLane, RateLimiter
+from bot.latency import LatencyTracker, api_timestamp
+from bot.preflight import run_preflight
+from bot.scheduler import CYCLE_BUDGET_SHARE, CycleScheduler
+from bot.subscriptions import (
+    MAX_WORKERS, Broadcaster, Subscriber, parse_subscribers
+)
+from bot.templates import (
+    DEFAULT_LOCALE, LOCALE_VERDICTS, MessageRenderer, StatusMessage
+)
+from bot.tracing import FileSpanExporter, Tracer
+from bot.transfer import ACCEPT_ENCODING, TransferStats, response_sizes
+from bot.transports import FileSink, HttpStatusSource
+
 logger = logging.getLogger(__name__)
 
 load_dotenv()
@@ -15,8 +43,34 @@ load_dotenv()
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+ADMIN_CHAT_ID = os.getenv('ADMIN_CHAT_ID')
+BOT_LOCALE = os.getenv('BOT_LOCALE', DEFAULT_LOCALE)
+BOT_DIGEST = os.getenv('BOT_DIGEST')
+CONFIG_FILE = os.getenv('CONFIG_FILE')
+TRACE_FILE = os.getenv('TRACE_FILE')
+TELEGRAM_SUBSCRIBERS = parse_subscribers(
+    os.getenv('TELEGRAM_SUBSCRIBERS', ''), BOT_LOCALE
+)
+STATE_FILE = os.getenv('STATE_FILE')
+ACCOUNTS_FILE = os.getenv('ACCOUNTS_FILE')
+COMMANDS_ENABLED = os.getenv('COMMANDS_ENABLED', 'false').lower() == 'true'
+HEALTH_PORT = os.getenv('HEALTH_PORT')
+WATCHDOG_ACTION = os.getenv('WATCHDOG_ACTION', 'flag')
+DELIVERY_LANES = os.getenv('DELIVERY_LANES', 'false').lower() == 'true'
+NOTIFY_RATE = float(os.getenv('NOTIFY_RATE', '1'))
+NOTIFY_BURST = int(os.getenv('NOTIFY_BURST', '5'))
+POLL_WORKERS = int(os.getenv('POLL_WORKERS', '1'))
+PREFLIGHT = os.getenv('PREFLIGHT', 'auto').lower()
+EXPORT_FILE = os.getenv('EXPORT_FILE')
+
+DEFAULT_ACCOUNT = 'default'
 
 RETRY_PERIOD = 600
+REQUEST_TIMEOUT = 30
+STALL_TIMEOUT = 120
+POLL_STALL_TIMEOUT = REQUEST_TIMEOUT + STALL_TIMEOUT
+# Потоки рассылки, основной цикл, две полосы доставки и getUpdates.
+TELEGRAM_POOL_SIZE = MAX_WORKERS + 4
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
@@ -26,38 +80,248 @@ HOMEWORK_VERDICTS = {
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
 
+renderer = MessageRenderer(
+    {**LOCALE_VERDICTS, DEFAULT_LOCALE: HOMEWORK_VERDICTS}
+)
+broadcaster = Broadcaster()
+heartbeat = Heartbeat()
+errors = ErrorAggregator()
+digests = DigestCollector(digest_file(STATE_FILE))
+latency = LatencyTracker()
+tracer = Tracer()
+scheduler = CycleScheduler()
+transfer = TransferStats()
+coalesced = Counter()
+alert_lane = DeliveryLane('alerts')
+notification_lane = DeliveryLane(
+    'notifications', RateLimiter(NOTIFY_RATE, NOTIFY_BURST)
+)
+
+
+def build_renderer(verdicts, locale_verdicts=None):
+    """Собирает шаблоны для вердиктов по умолчанию и других языков."""
+    return MessageRenderer(
+        {**LOCALE_VERDICTS, **(locale_verdicts or {}),
+         DEFAULT_LOCALE: verdicts}
+    )
+
+
+def read_subscribers(value):
+    """Подписчики из файла настроек: строка или список строк."""
+    if isinstance(value, list):
+        value = ','.join(value)
+    return parse_subscribers(value, BOT_LOCALE)
+
+
+def positive(convert):
+    """Преобразование, которое отвергает нулевые и отрицательные значения."""
+    def check(value):
+        value = convert(value)
+        if value <= 0:
+            raise ValueError(f'Ожидалось положительное число: {value}')
+        return value
+    return check
+
+
+def text(value):
+    """Непустая строка; числа, например id чата, приводятся к строке."""
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise ValueError(f'Ожидалась строка: {value!r}')
+    value = str(value).strip()
+    if not value:
+        raise ValueError('Ожидалась непустая строка')
+    return value
+
+
+def url(value):
+    """Адрес с протоколом http или https."""
+    value = text(value)
+    parts = urlsplit(value)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        raise ValueError(f'Ожидался адрес http(s): {value}')
+    return value
+
+
+CONFIG_KEYS = {
+    'retry_period': ('RETRY_PERIOD', positive(int)),
+    'endpoint': ('ENDPOINT', url),
+    'practicum_token': ('PRACTICUM_TOKEN', text),
+    'admin_chat_id': ('ADMIN_CHAT_ID', text),
+    'subscribers': ('TELEGRAM_SUBSCRIBERS', read_subscribers),
+    'notify_rate': ('NOTIFY_RATE', positive(float)),
+    'notify_burst': ('NOTIFY_BURST', positive(int)),
+}
+
+
+def apply_config(config):
+    """Применяет настройки из файла без перезапуска бота.
+
+    Все значения сначала проверяются и только потом подменяются
+    одним обновлением, поэтому ошибка в файле не меняет ничего.
+    """
+    updates = {
+        name: convert(config[key])
+        for key, (name, convert) in CONFIG_KEYS.items() if key in config
+    }
+    current = {**globals(), **updates}
+    if 'practicum_token' in config:
+        updates['HEADERS'] = {
+            'Authorization': f'OAuth {current["PRACTICUM_TOKEN"]}'
+        }
+    verdicts = dict(config.get('verdicts', {}))
+    if verdicts:
+        updates['HOMEWORK_VERDICTS'] = {
+            **HOMEWORK_VERDICTS, **verdicts.pop(DEFAULT_LOCALE, {})
+        }
+        updates['renderer'] = build_renderer(
+            updates['HOMEWORK_VERDICTS'],
+            {
+                locale: {**renderer.verdicts.get(locale, {}), **texts}
+                for locale, texts in verdicts.items()
+            }
+        )
+    if 'notify_rate' in config or 'notify_burst' in config:
+        notification_lane.limiter = RateLimiter(
+            current['NOTIFY_RATE'], current['NOTIFY_BURST']
+        )
+    globals().update(updates)
+
+
+def get_subscribers():
+    """Возвращает основной чат и дополнительных подписчиков."""
+    subscribers = {}
+    for subscriber in (
+        Subscriber(str(TELEGRAM_CHAT_ID), BOT_LOCALE, BOT_DIGEST),
+        *TELEGRAM_SUBSCRIBERS
+    ):
+        subscribers.setdefault(subscriber.chat_id, subscriber)
+    return list(subscribers.values())
+
+
+def subscribers_of(account):
+    """Подписчики аккаунта."""
+    if account.subscribers is None:
+        return get_subscribers()
+    return account.subscribers
+
+
+def deliver(bot, subscribers, message):
+    """Рассылает сообщение подписчикам и отмечает успешную отправку."""
+    started = time.time()
+    with tracer.span('send_message', recipients=len(subscribers)) as span:
+        results = broadcaster.broadcast(
+            lambda chat_id, text: bot.send_message(chat_id=chat_id, text=text),
+            subscribers,
+            message,
+            renderer.localize
+        )
+        span.set('delivered', sum(results.values()))
+    if not any(results.values()):
+        return
+    heartbeat.beat('send')
+    marks = getattr(message, 'marks', None)
+    if marks:
+        latency.observe_delivery(marks, started, time.time())
+
+
+def dispatch(lane, bot, subscribers, message):
+    """Отправляет через полосу доставки, если она запущена.
+
+    Если очередь полосы переполнена, сообщение отправляется сразу.
+    Отправка из полосы остаётся в трассе этапа, который её поставил.
+    """
+    if lane.is_alive():
+        if hasattr(message, 'marks'):
+            message.marks['queued'] = time.time()
+        parent = tracer.current()
+
+        def job():
+            with tracer.attach(parent):
+                deliver(bot, subscribers, message)
+
+        if lane.submit(job):
+            return
+    deliver(bot, subscribers, message)
+
+
+def drain_lanes():
+    """Дожидается отправки сообщений, оставшихся в очередях доставки."""
+    for lane in (alert_lane, notification_lane):
+        if lane.is_alive():
+            lane.drain()
+
+
+def notify(bot, subscribers, message):
+    """Отправляет уведомление подписчикам.
+
+    Подписчики, выбравшие сводку, получают изменения статусов в ней.
+    """
+    if isinstance(message, StatusMessage):
+        subscribers = [
+            subscriber for subscriber in subscribers
+            if subscriber.digest not in DIGEST_PERIODS
+        ]
+    dispatch(notification_lane, bot, subscribers, message)
+
 
 def send_message(bot, message: str) -> None:
-    """отправляет сообщение в Telegram чат."""
+    """Отправляет сообщение всем подписчикам в Telegram."""
     logging.info('Отправка сообщения в телеграмм чат')
-    try:
-        bot.send_message(
-            chat_id=TELEGRAM_CHAT_ID,
-            text=message
-        )
-    except Exception as error:
-        logger.error(f'Сообщение {message} об ошибки: {error}')
-    else:
-        logging.debug(f'Собщение {message} было отправлено')
+    notify(bot, get_subscribers(), message)
+
+
+def send_digests(bot, accounts):
+    """Отправляет сводки подписчикам, у которых подошло время."""
+    subscribers = {
+        subscriber.chat_id: subscriber
+        for account in accounts for subscriber in subscribers_of(account)
+    }
+    for subscriber, transitions in digests.due(list(subscribers.values())):
+        text = render_digest(transitions, subscriber.locale, renderer.verdict)
+        dispatch(notification_lane, bot, [subscriber], text)
+    digests.save()
+
+
+def send_alert(bot, message):
+    """Отправляет служебное сообщение в чат администратора."""
+    logger.info('Отправка служебного сообщения')
+    admin = Subscriber(str(ADMIN_CHAT_ID or TELEGRAM_CHAT_ID), BOT_LOCALE)
+    dispatch(alert_lane, bot, [admin], message)
 
 
 def get_api_answer(current_timestamp: int) -> int:
     """Делает запрос к единственному эндпоинту API-сервиса."""
+    return request_statuses(HEADERS, current_timestamp)
+
+
+def request_statuses(headers, current_timestamp, account=DEFAULT_ACCOUNT):
+    """Запрос к API домашки с заголовками нужного аккаунта.
+
+    Ответ запрашивается сжатым, размер и время разбора учитываются.
+    """
     params = {'from_date': current_timestamp}
     try:
         homework = requests.get(
             url=ENDPOINT,
-            headers=HEADERS,
-            params=params
+            headers={**headers, 'Accept-Encoding': ACCEPT_ENCODING},
+            params=params,
+            timeout=REQUEST_TIMEOUT
         )
     except Exception as error:
         raise ConnectionError(f'Ошибка:{error}, {ENDPOINT} недоступен.')
     if homework.status_code != HTTPStatus.OK:
         raise ValueError(
-            f'Ожидали: {homework.status_code.HTTPStatus.OK},'
-            f'пришёл: {homework.status_code}'
+            f'Ожидали: {HTTPStatus.OK}, пришёл: {homework.status_code}'
         )
-    return homework.json()
+    started = time.perf_counter()
+    response = homework.json()
+    decode_seconds = time.perf_counter() - started
+    wire_bytes, body_bytes = response_sizes(homework)
+    transfer.record(account, wire_bytes, body_bytes, decode_seconds)
+    span = tracer.current()
+    span.set('payload.wire_bytes', wire_bytes)
+    span.set('payload.body_bytes', body_bytes)
+    return response
 
 
 def check_response(response):
@@ -89,8 +353,307 @@ def parse_status(homework):
             f'Не верный статус домашней работы {homework_status}'
             f'Доступыне: {HOMEWORK_VERDICTS}'
         )
-    verdict = HOMEWORK_VERDICTS[homework_status]
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    text = renderer.render(DEFAULT_LOCALE, homework_status, homework_name)
+    return StatusMessage(text, homework_status, homework_name)
+
+
+def describe_status(homework):
+    """Возвращает вердикт для ответа на команду /status."""
+    status = homework.get('status')
+    return HOMEWORK_VERDICTS.get(status, status)
+
+
+def process_homeworks(bot, account, homeworks, fetched_at=None):
+    """Отправляет сообщения о работах с изменившимся статусом."""
+    fetched_at = fetched_at or time.time()
+    for homework in sorted(
+        homeworks, key=lambda homework: homework.get('date_updated') or ''
+    ):
+        with tracer.span('parse_status', status=str(homework.get('status'))):
+            message = parse_status(homework)
+        transition = account.state.update(homework)
+        if transition:
+            logger.info(f'Изменился статус работы {message.homework_name}')
+            message.marks = {
+                'account': account.name,
+                'updated': api_timestamp(homework.get('date_updated')),
+                'fetched': fetched_at,
+            }
+            if account.subscribers is None:
+                send_message(bot, message)
+            else:
+                notify(bot, account.subscribers, message)
+            digests.add(subscribers_of(account), transition)
+    if not homeworks:
+        logger.debug('Нет новых статусов')
+
+
+def fetch_http(account, from_date):
+    """Запрос к API от имени аккаунта."""
+    if account.token is None:
+        return get_api_answer(from_date)
+    return request_statuses(account.headers, from_date, account.name)
+
+
+status_source = HttpStatusSource(fetch_http)
+
+
+def fetch_statuses(account, from_date):
+    """Ответ источника статусов для аккаунта."""
+    return status_source.fetch(account, from_date)
+
+
+def load_statuses(account, from_date):
+    """Запрос к API и проверка ответа для аккаунта."""
+    with tracer.span('get_api_answer', account=account.name) as span:
+        span.set('from_date', from_date)
+        response = fetch_statuses(account, from_date)
+    heartbeat.beat('poll')
+    with tracer.span('check_response', account=account.name) as span:
+        homeworks = check_response(response)
+        span.set('homeworks', len(homeworks))
+    return response, homeworks
+
+
+def fetch_account(account, cache=None):
+    """Запрос к API и проверка ответа; можно выполнять в пуле потоков.
+
+    С общим cache аккаунты с одним токеном и одинаковым from_date
+    получают результат одного запроса.
+    """
+    from_date = account.cursor.from_date()
+    if cache is None:
+        response, homeworks = load_statuses(account, from_date)
+    else:
+        token = PRACTICUM_TOKEN if account.token is None else account.token
+        response, homeworks = cache.get(
+            (token, from_date), lambda: load_statuses(account, from_date)
+        )
+    return response, homeworks, time.time()
+
+
+def apply_poll(bot, account, polled):
+    """Рассылает изменения из ответа API и сдвигает курсор аккаунта."""
+    response, homeworks, fetched_at = polled
+    with tracer.span('process_homeworks', account=account.name):
+        process_homeworks(bot, account, homeworks, fetched_at)
+    account.cursor.advance(response)
+    account.state.cursor = account.cursor.position
+    account.state.save()
+    errors.resolve(account.name)
+
+
+def run_cycle(bot, account, cache=None):
+    """Опрос API для аккаунта и рассылка изменившихся статусов."""
+    with tracer.span('cycle', account=account.name):
+        apply_poll(bot, account, fetch_account(account, cache))
+
+
+def poll_account(bot, account, cache=None):
+    """Опрашивает аккаунт; сбой одного аккаунта не мешает остальным."""
+    try:
+        run_cycle(bot, account, cache)
+    except Exception as error:
+        report_error(bot, error, account)
+    finally:
+        heartbeat.progress(POLL_STALL_TIMEOUT)
+
+
+def collect_poll(bot, account, future, cycle):
+    """Обрабатывает результат опроса из пула потоков в спане cycle."""
+    try:
+        with tracer.attach(cycle):
+            apply_poll(bot, account, future.result())
+    except Exception as error:
+        report_error(bot, error, account)
+    finally:
+        heartbeat.progress(POLL_STALL_TIMEOUT)
+
+
+def poll_pooled(bot, accounts, budget, pool, cache):
+    """Опрашивает аккаунты в пуле потоков.
+
+    Спан cycle аккаунта начинается при постановке запроса в пул, так что
+    запрос в потоке пула и рассылка в основном потоке попадают в одну
+    трассу. Спаны отменённых запросов не выгружаются.
+    """
+    cycles = {
+        account.name: tracer.start('cycle', account=account.name)
+        for account in accounts
+    }
+
+    def fetch(account):
+        with tracer.attach(cycles[account.name]):
+            return fetch_account(account, cache)
+
+    def process(account, future):
+        try:
+            collect_poll(bot, account, future, cycles[account.name])
+        finally:
+            tracer.finish(cycles[account.name])
+
+    return scheduler.run_pooled(accounts, fetch, process, budget, pool)
+
+
+def poll_accounts(bot, accounts, budget, pool=None):
+    """Опрашивает аккаунты по очереди или в пуле потоков.
+
+    Общие результаты запросов живут не дольше одного обхода.
+    """
+    cache = SingleFlight()
+    try:
+        if pool is None:
+            return scheduler.run(
+                accounts,
+                lambda account: poll_account(bot, account, cache),
+                budget
+            )
+        return poll_pooled(bot, accounts, budget, pool, cache)
+    finally:
+        coalesced.update(loads=cache.loads, shared=cache.shared)
+
+
+def report_error(bot, error, account=None):
+    """Сообщает об ошибке, если она не повторяет недавнюю."""
+    source = account.name if account else 'main'
+    message = f'Сбой в работе программы: {error}'
+    if account and account.name != DEFAULT_ACCOUNT:
+        message = f'Сбой в работе программы ({account.name}): {error}'
+    logger.critical(message)
+    if errors.record(error, source):
+        send_alert(bot, message)
+
+
+def build_accounts():
+    """Основной аккаунт из окружения и аккаунты из ACCOUNTS_FILE."""
+    accounts = [Account(DEFAULT_ACCOUNT, None, state_file=STATE_FILE)]
+    if ACCOUNTS_FILE:
+        accounts.extend(load_accounts(
+            ACCOUNTS_FILE,
+            lambda raw: parse_subscribers(raw, BOT_LOCALE),
+            STATE_FILE
+        ))
+    for account in accounts:
+        account.load()
+    digests.load()
+    return accounts
+
+
+def on_stall(stage):
+    """Реакция сторожа на зависший цикл."""
+    if WATCHDOG_ACTION == 'exit':
+        logger.critical('Перезапуск процесса из-за зависания цикла')
+        drain_lanes()
+        os._exit(1)
+
+
+def check_practicum_token(account):
+    """Пробный запрос к API с токеном аккаунта."""
+    headers = HEADERS if account.token is None else account.headers
+    response = requests.get(
+        url=ENDPOINT,
+        headers=headers,
+        params={'from_date': int(time.time())},
+        timeout=REQUEST_TIMEOUT
+    )
+    if response.status_code in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+        return False
+    if response.status_code != HTTPStatus.OK:
+        raise ValueError(f'API ответил {response.status_code}')
+    return True
+
+
+def check_telegram_token(bot):
+    """Проверяет токен бота запросом getMe."""
+    try:
+        bot.get_me()
+    except (telegram.error.Unauthorized, telegram.error.InvalidToken):
+        return False
+    return True
+
+
+def preflight(bot, accounts):
+    """Проверяет все токены до старта и ставит плохие аккаунты в карантин.
+
+    Если недействителен токен бота или все токены Практикума, бот
+    останавливается.
+    """
+    checks = {
+        f'account:{account.name}': (
+            lambda account=account: check_practicum_token(account)
+        )
+        for account in accounts
+    }
+    checks['telegram'] = lambda: check_telegram_token(bot)
+    results = run_preflight(checks)
+    if results.pop('telegram') is False:
+        message = 'Недействительный TELEGRAM_TOKEN'
+        logger.critical(message)
+        raise ValueError(message)
+    for account in accounts:
+        if results[f'account:{account.name}'] is False:
+            account.quarantined = True
+            logger.critical(
+                f'Токен аккаунта {account.name} недействителен, '
+                'аккаунт не будет опрашиваться'
+            )
+    if all(account.quarantined for account in accounts):
+        message = 'Нет ни одного действительного токена Практикума'
+        logger.critical(message)
+        raise ValueError(message)
+
+
+def find_states(accounts, chat_id):
+    """Состояния аккаунтов, на которые подписан чат."""
+    return [
+        account.state for account in accounts
+        if any(
+            subscriber.chat_id == chat_id
+            for subscriber in subscribers_of(account)
+        )
+    ]
+
+
+def start_services(bot, accounts):
+    """Запускает фоновые сервисы, включённые в настройках."""
+    if COMMANDS_ENABLED:
+        CommandListener(
+            bot,
+            lambda chat_id: find_states(accounts, chat_id),
+            describe_status
+        ).start()
+    if DELIVERY_LANES:
+        alert_lane.start()
+        notification_lane.start()
+    if CONFIG_FILE:
+        watcher = ConfigWatcher(CONFIG_FILE, apply_config)
+        watcher.check()
+        watcher.start()
+    if TRACE_FILE:
+        tracer.exporter = FileSpanExporter(TRACE_FILE)
+        tracer.exporter.start()
+    if HEALTH_PORT:
+        HealthServer(int(HEALTH_PORT), {
+            '/health': heartbeat.report,
+            '/metrics': lambda: {
+                'latency': latency.report(),
+                'scheduler': scheduler.report(),
+                'transfer': transfer.report(),
+                'coalesced': dict(coalesced),
+            },
+        }).start()
+    if HEALTH_PORT or WATCHDOG_ACTION == 'exit':
+        Watchdog(heartbeat, on_stall).start()
+
+
+def pool_connections(bot):
+    """Даёт боту пул соединений на все потоки отправки.
+
+    У telegram.Bot по умолчанию одно соединение, и при параллельной
+    рассылке на каждое сообщение открывается новое TLS-соединение.
+    """
+    if hasattr(bot, '_request'):
+        bot._request = Request(con_pool_size=TELEGRAM_POOL_SIZE)
 
 
 def check_tokens():
@@ -122,32 +685,36 @@ def main():
         logger.critical(message)
         raise ValueError(message)
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    send_message(bot, 'Бот начал работу')
-    current_timestamp = int(time.time())
-    previous_status = None
-    last_error = ''
-    while True:
-        try:
-            response = get_api_answer(current_timestamp)
-            homework = check_response(response)
-            for homworks in homework:
-                if homworks:
-                    logging.info('Собщение об изменение статуса отправлена')
-                    hw_status = homework[0].get('status')
-                    if hw_status != previous_status:
-                        previous_status = hw_status
-                        message = parse_status(homework[0])
-                        send_message(bot, message)
-                    logging.debug('Нет новых статусов')
-                    current_timestamp = response.get('current_date')
-        except Exception as error:
-            logging.critical(f'Сбой отправки сообщения: {error}')
-            message = f'Сбой в работе программы: {error}'
-            if str(error) != str(last_error):
-                send_message(bot, message)
-                last_error = error
-        finally:
-            time.sleep(RETRY_PERIOD)
+    pool_connections(bot)
+    sink = FileSink(EXPORT_FILE) if EXPORT_FILE else bot
+    accounts = build_accounts()
+    if PREFLIGHT == 'true' or PREFLIGHT == 'auto' and len(accounts) > 1:
+        preflight(bot, accounts)
+    start_services(bot, accounts)
+    pool = None
+    if POLL_WORKERS > 1:
+        pool = ThreadPoolExecutor(
+            max_workers=POLL_WORKERS, thread_name_prefix='poll'
+        )
+    send_message(sink, 'Бот начал работу')
+    try:
+        while True:
+            budget = RETRY_PERIOD * CYCLE_BUDGET_SHARE
+            heartbeat.enter('cycle', POLL_STALL_TIMEOUT)
+            try:
+                poll_accounts(sink, accounts, budget, pool)
+                errors.resolve('main')
+            except Exception as error:
+                report_error(sink, error)
+            finally:
+                send_digests(sink, accounts)
+                summary = errors.summary()
+                if summary:
+                    send_alert(sink, summary)
+                heartbeat.enter('sleep', RETRY_PERIOD + STALL_TIMEOUT)
+                time.sleep(RETRY_PERIOD)
+    finally:
+        drain_lanes()
 
 
 if __name__ == '__main__':
@@ -163,4 +730,5 @@ if __name__ == '__main__':
         mode='a'
     )
     logger.addHandler(handler)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
     main()
@@ -1,9 +1,13 @@
 import random
 import string
 from datetime import datetime
+from types import SimpleNamespace
 
 import pytest
 
+from bot.accounts import Account
+from bot.transports import InMemorySink, InMemoryStatusSource
+
 
 @pytest.fixture
 def random_timestamp():
@@ -23,6 +27,20 @@ def homework_module():
     return homework
 
 
+@pytest.fixture
+def offline_poll(monkeypatch, homework_module):
+    source = InMemoryStatusSource()
+    monkeypatch.setattr(homework_module, 'status_source', source)
+    account = Account(
+        'student', 'token', homework_module.read_subscribers(['42'])
+    )
+    account.load()
+    source.put('student', [{
+        'id': 1, 'homework_name': 'hw123', 'status': 'approved'
+    }])
+    return SimpleNamespace(source=source, sink=InMemorySink(), account=account)
+
+
 @pytest.fixture
 def random_message():
     def random_string(string_length=15):
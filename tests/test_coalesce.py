@@ -0,0 +1,105 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bot.accounts import Account
+from bot.coalesce import SingleFlight
+
+
+class TestSingleFlight:
+
+    def test_concurrent_callers_share_one_load(self):
+        cache = SingleFlight(ttl=60)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def load():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'homeworks': []}
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(cache.get('key', load))
+        )
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(
+                target=lambda: results.append(cache.get('key', load))
+            )
+            for _ in range(3)
+        ]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+        assert len(calls) == 1, (
+            'Одновременные запросы с одним ключом должны выполняться один раз.'
+        )
+        assert len(results) == 4
+        assert all(result is results[0] for result in results)
+        assert (cache.loads, cache.shared) == (1, 3)
+
+    def test_result_expires_after_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+        cache = SingleFlight(ttl=5)
+        assert cache.get('key', lambda: 1) == 1
+        assert cache.get('key', lambda: 2) == 1
+        assert cache.get('other', lambda: 3) == 3
+        now[0] += 5
+        assert cache.get('key', lambda: 4) == 4, (
+            'После ttl результат нужно загрузить заново.'
+        )
+
+    def test_errors_are_not_cached(self):
+        cache = SingleFlight(ttl=60)
+
+        def fail():
+            raise ConnectionError('API недоступен')
+
+        with pytest.raises(ConnectionError):
+            cache.get('key', fail)
+        assert cache.get('key', lambda: 'ok') == 'ok', (
+            'Ошибка не должна сохраняться в кэше.'
+        )
+
+
+class TestCoalescedPoll:
+
+    @pytest.mark.parametrize('workers', [None, 2])
+    def test_accounts_with_same_token_share_request(
+            self, homework_module, offline_poll, workers):
+        source, sink = offline_poll.source, offline_poll.sink
+        mentor = Account(
+            'mentor', 'token', homework_module.read_subscribers(['43'])
+        )
+        mentor.load()
+        mentor.cursor.position = offline_poll.account.cursor.position
+        accounts = [offline_poll.account, mentor]
+        pool = ThreadPoolExecutor(workers) if workers else None
+        try:
+            homework_module.poll_accounts(
+                sink, accounts, homework_module.RETRY_PERIOD, pool
+            )
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        assert source.calls == 1, (
+            'Аккаунты с одним токеном должны получать общий ответ API.'
+        )
+        assert sorted(chat for chat, _ in sink.messages) == ['42', '43']
+
+        homework_module.poll_accounts(
+            sink, accounts, homework_module.RETRY_PERIOD
+        )
+        assert source.calls == 2, (
+            'Следующий обход должен снова обращаться к API.'
+        )
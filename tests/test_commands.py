@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from bot.commands import CommandListener
+from bot.state import HomeworkState
+
+
+class MockBot:
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+def make_listener(bot, state):
+    return CommandListener(
+        bot,
+        lambda chat_id: [state] if chat_id == '42' else [],
+        lambda homework: homework['status']
+    )
+
+
+class TestCommandListener:
+
+    def test_status_reply_from_state(self):
+        bot = MockBot()
+        state = HomeworkState()
+        state.update({'homework_name': 'hw123', 'status': 'approved'})
+        listener = make_listener(bot, state)
+        listener.handle(SimpleNamespace(chat_id=42, text='/status'))
+        assert bot.sent == [(42, 'Текущие статусы:\n"hw123": approved')]
+
+    def test_history_reply(self):
+        bot = MockBot()
+        state = HomeworkState()
+        state.update({'homework_name': 'hw123', 'status': 'reviewing'})
+        state.update({'homework_name': 'hw123', 'status': 'approved'})
+        make_listener(bot, state).handle(
+            SimpleNamespace(chat_id=42, text='/history@homework_bot')
+        )
+        assert 'reviewing → approved' in bot.sent[0][1]
+
+    def test_foreign_chat_and_unknown_command_ignored(self):
+        bot = MockBot()
+        listener = make_listener(bot, HomeworkState())
+        listener.handle(SimpleNamespace(chat_id=7, text='/status'))
+        listener.handle(SimpleNamespace(chat_id=42, text='/unknown'))
+        assert not bot.sent, (
+            'Бот не должен отвечать чужим чатам и на неизвестные команды.'
+        )
@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+from bot.config import ConfigWatcher
+
+RELOADED = (
+    'RETRY_PERIOD', 'ENDPOINT', 'PRACTICUM_TOKEN', 'HEADERS',
+    'HOMEWORK_VERDICTS', 'renderer', 'TELEGRAM_SUBSCRIBERS'
+)
+
+
+@pytest.fixture
+def reloadable(monkeypatch, homework_module):
+    for name in RELOADED:
+        monkeypatch.setattr(
+            homework_module, name, getattr(homework_module, name)
+        )
+    monkeypatch.setattr(
+        homework_module.notification_lane, 'limiter',
+        homework_module.notification_lane.limiter
+    )
+    return homework_module
+
+
+class TestConfig:
+
+    def test_watcher_applies_only_changes(self, tmp_path):
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps({'retry_period': 60}))
+        applied = []
+        watcher = ConfigWatcher(str(path), applied.append)
+        assert watcher.check()
+        assert not watcher.check()
+        path.write_text(json.dumps({'retry_period': 120}))
+        os.utime(path, ns=(1, 1))
+        assert watcher.check()
+        assert applied == [{'retry_period': 60}, {'retry_period': 120}]
+
+    def test_watcher_keeps_settings_on_broken_file(self, tmp_path):
+        path = tmp_path / 'config.json'
+        path.write_text('{broken')
+        applied = []
+        assert not ConfigWatcher(str(path), applied.append).check()
+        assert applied == []
+
+    def test_apply_config(self, reloadable):
+        reloadable.apply_config({
+            'retry_period': '300',
+            'practicum_token': 'new',
+            'subscribers': ['1:en', '2'],
+            'verdicts': {'ru': {'approved': 'Принято.'}},
+        })
+        assert reloadable.RETRY_PERIOD == 300
+        assert reloadable.HEADERS == {'Authorization': 'OAuth new'}
+        assert [item.chat_id for item in reloadable.TELEGRAM_SUBSCRIBERS] == [
+            '1', '2'
+        ]
+        assert reloadable.parse_status(
+            {'homework_name': 'hw', 'status': 'approved'}
+        ).endswith('Принято.')
+        assert reloadable.parse_status(
+            {'homework_name': 'hw', 'status': 'reviewing'}
+        ).endswith('Работа взята на проверку ревьюером.'), (
+            'Вердикты из файла должны дополнять текущие, а не заменять их.'
+        )
+
+    def test_apply_config_merges_locale_verdicts(self, reloadable):
+        reloadable.apply_config({'verdicts': {'en': {'approved': 'Ok!'}}})
+        renderer = reloadable.renderer
+        assert renderer.render('en', 'approved', 'hw').endswith('Ok!')
+        assert renderer.render('en', 'rejected', 'hw') == (
+            reloadable.build_renderer(reloadable.HOMEWORK_VERDICTS)
+            .render('en', 'rejected', 'hw')
+        )
+
+    def test_apply_config_is_all_or_nothing(self, reloadable):
+        with pytest.raises(ValueError):
+            reloadable.apply_config(
+                {'endpoint': 'http://other/', 'retry_period': 'often'}
+            )
+        assert reloadable.ENDPOINT.startswith('https://practicum.yandex.ru')
+        assert reloadable.RETRY_PERIOD == 600
+
+    @pytest.mark.parametrize('config', [
+        {'retry_period': 0},
+        {'retry_period': -5},
+        {'notify_rate': 0},
+        {'notify_burst': -1},
+        {'endpoint': None},
+        {'endpoint': ''},
+        {'endpoint': 'ftp://practicum.yandex.ru/'},
+        {'endpoint': 'practicum.yandex.ru/api/'},
+        {'practicum_token': None},
+        {'practicum_token': '  '},
+        {'admin_chat_id': None},
+        {'admin_chat_id': ['1']},
+    ])
+    def test_apply_config_rejects_non_positive(self, reloadable, config):
+        limiter = reloadable.notification_lane.limiter
+        headers = reloadable.HEADERS
+        with pytest.raises(ValueError):
+            reloadable.apply_config({'retry_period': 300, **config})
+        assert reloadable.RETRY_PERIOD == 600
+        assert reloadable.ENDPOINT.startswith('https://practicum.yandex.ru')
+        assert reloadable.HEADERS == headers
+        assert reloadable.notification_lane.limiter is limiter
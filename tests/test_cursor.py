@@ -0,0 +1,26 @@
+from bot.cursor import PollCursor
+
+
+class TestPollCursor:
+
+    def test_from_date_with_overlap(self):
+        cursor = PollCursor(1000, overlap=60, max_backfill=3600)
+        assert cursor.from_date(now=1100) == 940
+
+    def test_backfill_is_bounded(self):
+        cursor = PollCursor(1000, overlap=60, max_backfill=3600)
+        assert cursor.from_date(now=100000) == 100000 - 3600, (
+            'После долгого простоя курсор не должен уходить дальше '
+            '`max_backfill`.'
+        )
+
+    def test_advance_only_forward(self):
+        cursor = PollCursor(1000)
+        assert cursor.advance({'homeworks': [], 'current_date': 1200})
+        assert cursor.position == 1200, (
+            'Курсор должен сдвигаться и при пустом списке работ.'
+        )
+        assert not cursor.advance({'homeworks': [], 'current_date': 1100})
+        assert not cursor.advance({'homeworks': []})
+        assert not cursor.advance({'current_date': '1300'})
+        assert cursor.position == 1200
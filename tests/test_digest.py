@@ -0,0 +1,123 @@
+import time
+
+from bot.accounts import Account, account_state_file
+from bot.digest import (
+    DigestCollector, digest_file, render_digest, review_duration
+)
+from bot.state import Transition
+from bot.subscriptions import Subscriber
+from bot.transports import InMemorySink
+
+TRANSITION = Transition(
+    'hw123', 'reviewing', 'approved',
+    '2020-02-13T10:00:00Z', '2020-02-13T12:30:00Z', 0
+)
+
+
+def verdict(locale, status):
+    return f'{locale}:{status}'
+
+
+class TestDigest:
+
+    def test_review_duration(self):
+        assert review_duration(TRANSITION) == 2 * 60 * 60 + 30 * 60
+        assert review_duration(TRANSITION._replace(old_status=None)) is None
+        assert review_duration(TRANSITION._replace(old_updated='')) is None
+
+    def test_render_digest(self):
+        assert render_digest([TRANSITION], 'ru', verdict) == (
+            'Сводка изменений статусов:\n'
+            '"hw123": ru:approved (проверка заняла 2 ч 30 мин)'
+        )
+
+    def test_collector_sends_once_per_period(self):
+        subscribers = [
+            Subscriber('1', 'ru', 'hourly'), Subscriber('2', 'ru')
+        ]
+        digests = DigestCollector()
+        assert digests.due(subscribers, now=0) == []
+        digests.add(subscribers, TRANSITION)
+        digests.add(subscribers, TRANSITION)
+        assert digests.due(subscribers, now=60) == [], (
+            'Сводка не должна уходить раньше расписания.'
+        )
+        ready = digests.due(subscribers, now=3600)
+        assert ready == [(subscribers[0], [TRANSITION, TRANSITION])], (
+            'Сводку получают только подписчики с расписанием.'
+        )
+        assert digests.due(subscribers, now=7200) == []
+
+    def test_collector_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'digests.json')
+        subscribers = [Subscriber('1', 'ru', 'daily')]
+        digests = DigestCollector(path)
+        assert digests.due(subscribers, now=0) == []
+        digests.add(subscribers, TRANSITION)
+        digests.save()
+
+        restarted = DigestCollector(path)
+        restarted.load()
+        assert restarted.due(subscribers, now=3600) == [], (
+            'После перезапуска расписание сводки не должно начинаться заново.'
+        )
+        assert restarted.due(subscribers, now=24 * 60 * 60) == [
+            (subscribers[0], [TRANSITION])
+        ], 'Накопленные изменения должны пережить перезапуск.'
+
+    def test_collector_ignores_broken_file(self, tmp_path):
+        path = tmp_path / 'digests.json'
+        path.write_text('{broken')
+        digests = DigestCollector(str(path))
+        digests.load()
+        assert digests.due([Subscriber('1', 'ru', 'hourly')], now=0) == []
+
+    def test_digest_file_differs_from_account_files(self):
+        assert digest_file('state.json') == 'state.digests.json'
+        assert digest_file('state.json') != account_state_file(
+            'state.json', 'digests'
+        ), 'Файл сводок не должен совпадать с файлом аккаунта.'
+        assert digest_file('') is None
+
+
+class TestHomeworkDigests:
+
+    def subscribe(self, monkeypatch, homework_module, digests):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '1')
+        monkeypatch.setattr(homework_module, 'BOT_DIGEST', 'hourly')
+        monkeypatch.setattr(
+            homework_module, 'TELEGRAM_SUBSCRIBERS', [Subscriber('2', 'ru')]
+        )
+        monkeypatch.setattr(homework_module, 'digests', digests)
+
+    def test_notify_skips_digest_subscribers(
+            self, monkeypatch, homework_module):
+        self.subscribe(monkeypatch, homework_module, DigestCollector())
+        sink = InMemorySink()
+        homework_module.send_message(sink, homework_module.parse_status(
+            {'homework_name': 'hw123', 'status': 'approved'}
+        ))
+        assert [chat_id for chat_id, _ in sink.messages] == ['2'], (
+            'Подписчик сводки не должен получать отдельные уведомления.'
+        )
+        homework_module.send_message(sink, 'Бот начал работу')
+        assert [chat_id for chat_id, _ in sink.messages][1:] == ['1', '2']
+
+    def test_send_digests(self, monkeypatch, homework_module, tmp_path):
+        digests = DigestCollector(str(tmp_path / 'state.digests.json'))
+        self.subscribe(monkeypatch, homework_module, digests)
+        account = Account(homework_module.DEFAULT_ACCOUNT, None)
+        sink = InMemorySink()
+        homework_module.send_digests(sink, [account])
+        digests.add(homework_module.get_subscribers(), TRANSITION)
+        homework_module.send_digests(sink, [account])
+        assert list(sink.messages) == [], (
+            'Сводка не должна уходить раньше расписания.'
+        )
+        digests._last_sent['1'] = time.time() - 60 * 60
+        homework_module.send_digests(sink, [account])
+        [(chat_id, text)] = sink.messages
+        assert chat_id == '1' and '"hw123"' in text
+        assert (tmp_path / 'state.digests.json').exists(), (
+            'После рассылки сводки нужно сохранить их состояние.'
+        )
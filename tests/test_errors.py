@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from bot.errors import ErrorAggregator
+
+
+class TestErrorAggregator:
+
+    def test_alternating_errors_reported_once_per_ttl(self):
+        errors = ErrorAggregator(ttl=100)
+        notified = [
+            errors.record(error, 'api', now=moment)
+            for moment, error in enumerate(
+                [ValueError('a'), KeyError('b')] * 5, start=1
+            )
+        ]
+        assert notified.count(True) == 2, (
+            'Чередующиеся ошибки не должны каждый раз попадать в чат.'
+        )
+        assert errors.record(ValueError('a'), 'api', now=200)
+
+    def test_same_error_reported_after_recovery(self):
+        errors = ErrorAggregator(ttl=100)
+        assert errors.record(ValueError('a'), 'api', now=1)
+        errors.resolve('api')
+        assert errors.record(ValueError('a'), 'api', now=2), (
+            'После восстановления та же ошибка должна считаться новой.'
+        )
+
+    def test_summary_of_suppressed(self):
+        errors = ErrorAggregator(ttl=100, summary_period=50)
+        for moment in range(1, 4):
+            errors.record(ValueError('a'), 'api', now=moment)
+        summary = errors.summary(now=errors._last_summary + 50)
+        assert 'ValueError (api): 2 повт. (всего 3' in summary, (
+            'В сводке должны быть число повторов и всего ошибок группы.'
+        )
+        assert summary.endswith(': a'), 'В сводке нужен пример ошибки.'
+        assert errors.summary(now=errors._last_summary + 100) is None
+
+    def test_main_loop_error_reported_after_recovery(
+            self, monkeypatch, homework_module):
+        alerts = []
+        results = iter([ValueError('сбой'), None, ValueError('сбой')])
+
+        def poll_accounts(bot, accounts, budget, pool=None):
+            error = next(results)
+            if error is not None:
+                raise error
+
+        def sleep(seconds):
+            if next(cycles) == 3:
+                raise KeyboardInterrupt
+
+        cycles = iter(range(1, 4))
+        monkeypatch.setattr(homework_module, 'errors', ErrorAggregator())
+        monkeypatch.setattr(homework_module, 'check_tokens', lambda: True)
+        monkeypatch.setattr(homework_module, 'build_accounts', list)
+        monkeypatch.setattr(
+            homework_module, 'start_services', lambda bot, accounts: None
+        )
+        monkeypatch.setattr(
+            homework_module, 'send_message', lambda bot, message: None
+        )
+        monkeypatch.setattr(
+            homework_module, 'send_digests', lambda bot, accounts: None
+        )
+        monkeypatch.setattr(
+            homework_module, 'send_alert',
+            lambda bot, message: alerts.append(message)
+        )
+        monkeypatch.setattr(homework_module, 'poll_accounts', poll_accounts)
+        monkeypatch.setattr(time, 'sleep', sleep)
+        with pytest.raises(KeyboardInterrupt):
+            homework_module.main()
+        assert len(alerts) == 2, (
+            'Ошибка основного цикла после восстановления должна снова '
+            'попадать в чат.'
+        )
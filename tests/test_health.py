@@ -0,0 +1,104 @@
+import json
+import time
+from urllib.request import urlopen
+
+from bot.accounts import Account
+from bot.health import HealthServer, Heartbeat, Watchdog
+
+
+class TestHealth:
+
+    def test_heartbeat_report(self):
+        heartbeat = Heartbeat()
+        heartbeat.enter('cycle', 60)
+        heartbeat.beat('poll')
+        report = heartbeat.report()
+        assert report['status'] == 'ok'
+        assert report['since_last_poll'] is not None
+        assert report['since_last_send'] is None
+
+    def test_watchdog_flags_stalled_stage_once(self):
+        stalls = []
+        heartbeat = Heartbeat()
+        heartbeat.enter('cycle', -1)
+        watchdog = Watchdog(heartbeat, stalls.append)
+        watchdog.check()
+        watchdog.check()
+        assert stalls == ['cycle'], (
+            'Сторож должен сообщать о зависании этапа один раз.'
+        )
+        assert heartbeat.report()['status'] == 'stalled'
+
+    def test_progress_extends_stage(self):
+        heartbeat = Heartbeat()
+        heartbeat.enter('cycle', -1)
+        heartbeat.stalled = True
+        heartbeat.progress(60)
+        assert heartbeat.stage == 'cycle'
+        assert heartbeat.report()['status'] == 'ok'
+        assert not heartbeat.stalled
+
+    def test_long_cycle_with_progress_is_healthy(
+            self, monkeypatch, homework_module):
+        clock = [time.time()]
+        monkeypatch.setattr(time, 'time', lambda: clock[0])
+
+        def poll(bot, account, cache=None):
+            clock[0] += homework_module.REQUEST_TIMEOUT
+
+        monkeypatch.setattr(homework_module, 'run_cycle', poll)
+        monkeypatch.setattr(homework_module, 'heartbeat', Heartbeat())
+        accounts = [Account(str(number), 'token') for number in range(20)]
+        for account in accounts:
+            account.state.update({'id': 1, 'status': 'reviewing'})
+        homework_module.heartbeat.enter(
+            'cycle', homework_module.POLL_STALL_TIMEOUT
+        )
+        homework_module.poll_accounts(None, accounts, budget=0)
+        assert homework_module.heartbeat.report()['status'] == 'ok', (
+            'Цикл, в котором аккаунты опрашиваются без зависаний, '
+            'не должен считаться зависшим, даже если он длинный.'
+        )
+
+    def test_watchdog_starts_without_health_port(
+            self, monkeypatch, homework_module):
+        started = []
+
+        class RecordingWatchdog:
+            def __init__(self, heartbeat, on_stall):
+                self.on_stall = on_stall
+
+            def start(self):
+                started.append(self.on_stall)
+
+        monkeypatch.setattr(homework_module, 'Watchdog', RecordingWatchdog)
+        monkeypatch.setattr(homework_module, 'HEALTH_PORT', None)
+        for action, expected in (('flag', []), ('exit', [
+            homework_module.on_stall
+        ])):
+            started.clear()
+            monkeypatch.setattr(homework_module, 'WATCHDOG_ACTION', action)
+            homework_module.start_services(None, [])
+            assert started == expected, (
+                'Сторож с WATCHDOG_ACTION=exit должен работать '
+                'и без HEALTH_PORT.'
+            )
+
+    def test_health_server_status_codes(self):
+        heartbeat = Heartbeat()
+        server = HealthServer(0, {'/health': heartbeat.report}, '127.0.0.1')
+        server.start()
+        url = f'http://127.0.0.1:{server.server.server_port}/health'
+        try:
+            with urlopen(url) as response:
+                assert json.load(response)['status'] == 'ok'
+            heartbeat.enter('cycle', -1)
+            time.sleep(0.01)
+            try:
+                urlopen(url)
+            except Exception as error:
+                assert error.code == 503
+            else:
+                raise AssertionError('Зависший цикл должен отдавать 503.')
+        finally:
+            server.stop()
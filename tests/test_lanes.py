@@ -0,0 +1,116 @@
+from threading import Event
+
+import pytest
+
+from bot.lanes import DeliveryLane, RateLimiter
+from bot.transports import InMemorySink
+
+
+class TestLanes:
+
+    def test_rate_limiter_burst(self):
+        limiter = RateLimiter(rate=1, burst=2)
+        assert limiter.delay() == 0
+        assert limiter.delay() == 0
+        assert 0 < limiter.delay() <= 1, (
+            'После исчерпания burst отправка должна ждать.'
+        )
+
+    @pytest.mark.parametrize('rate, burst', [(0, 1), (-1, 1), (1, 0)])
+    def test_rate_limiter_rejects_non_positive(self, rate, burst):
+        with pytest.raises(ValueError):
+            RateLimiter(rate, burst)
+
+    def test_lane_survives_limiter_error(self):
+        class BrokenOnceLimiter:
+            calls = 0
+
+            def delay(self):
+                self.calls += 1
+                if self.calls == 1:
+                    raise ZeroDivisionError('float division by zero')
+                return 0
+
+        done = Event()
+        lane = DeliveryLane('broken', BrokenOnceLimiter())
+        lane.start()
+        try:
+            lane.submit(lambda: None)
+            lane.submit(done.set)
+            assert done.wait(3), (
+                'Сбой лимита не должен останавливать полосу доставки.'
+            )
+            assert lane.is_alive()
+        finally:
+            lane.stop()
+
+    def test_slow_lane_does_not_delay_other(self):
+        release = Event()
+        done = Event()
+        slow = DeliveryLane('slow')
+        fast = DeliveryLane('fast')
+        slow.start()
+        fast.start()
+        try:
+            for _ in range(3):
+                slow.submit(lambda: release.wait(5))
+            fast.submit(done.set)
+            assert done.wait(2), (
+                'Сообщение быстрой полосы не должно ждать медленную.'
+            )
+        finally:
+            release.set()
+            slow.stop()
+            fast.stop()
+
+    def test_full_lane_drops(self):
+        lane = DeliveryLane('tiny', maxsize=1)
+        assert lane.submit(lambda: None)
+        assert not lane.submit(lambda: None)
+        assert lane.dropped == 1
+
+    def test_drain_waits_for_queue(self):
+        done = []
+        lane = DeliveryLane('drain')
+        for number in range(3):
+            lane.submit(lambda number=number: done.append(number))
+        lane.start()
+        try:
+            assert lane.drain(timeout=2)
+            assert done == [0, 1, 2], (
+                'drain должен дождаться отправки всей очереди.'
+            )
+        finally:
+            lane.stop()
+
+    def test_drain_of_stopped_lane_reports_pending(self):
+        lane = DeliveryLane('stopped')
+        lane.submit(lambda: None)
+        assert not lane.drain(timeout=0.1)
+
+
+class TestHomeworkDelivery:
+
+    def test_alert_goes_to_admin_chat(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '1')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_SUBSCRIBERS', [])
+        monkeypatch.setattr(homework_module, 'ADMIN_CHAT_ID', '99')
+        sink = InMemorySink()
+        homework_module.send_alert(sink, 'Сбой')
+        homework_module.send_message(sink, 'Статус')
+        assert list(sink.messages) == [('99', 'Сбой'), ('1', 'Статус')], (
+            'Служебные сообщения идут администратору, статусы — подписчикам.'
+        )
+
+    def test_full_lane_delivers_inline(self, monkeypatch, homework_module):
+        lane = DeliveryLane('full', maxsize=1)
+        lane.submit(lambda: None)
+        monkeypatch.setattr(lane, 'is_alive', lambda: True)
+        monkeypatch.setattr(homework_module, 'notification_lane', lane)
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '1')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_SUBSCRIBERS', [])
+        sink = InMemorySink()
+        homework_module.send_message(sink, 'Статус')
+        assert list(sink.messages) == [('1', 'Статус')], (
+            'При переполненной очереди сообщение нужно отправить сразу.'
+        )
@@ -0,0 +1,35 @@
+from bot.latency import LatencyTracker, api_timestamp, summarize
+
+
+class TestLatency:
+
+    def test_api_timestamp(self):
+        assert api_timestamp('1970-01-01T00:01:00Z') == 60
+        assert api_timestamp(None) is None
+
+    def test_summarize_percentiles(self):
+        summary = summarize(range(1, 101))
+        assert summary == {'p50': 50, 'p95': 95, 'p99': 99, 'count': 100}
+        assert summarize([]) == {'count': 0}
+
+    def test_observe_delivery_stages(self):
+        tracker = LatencyTracker()
+        tracker.observe_delivery(
+            {'account': 'student', 'updated': 100, 'fetched': 160,
+             'queued': 161},
+            started=171, sent=172
+        )
+        report = tracker.report()
+        expected = {
+            'poll_wait': 60, 'processing': 1, 'queueing': 10,
+            'send': 1, 'total': 72
+        }
+        for stage, seconds in expected.items():
+            assert report['by_stage'][stage]['p50'] == seconds, stage
+            assert report['by_account']['student'][stage]['p99'] == seconds
+
+    def test_window_is_bounded(self):
+        tracker = LatencyTracker(window=3)
+        for seconds in range(10):
+            tracker.observe('default', 'send', seconds)
+        assert tracker.report()['by_stage']['send']['count'] == 3
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+import requests
+import telegram
+
+from bot.accounts import Account
+from bot.preflight import run_preflight
+
+
+class MockResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class MockBot:
+    def __init__(self, error=None):
+        self.error = error
+
+    def get_me(self):
+        if self.error:
+            raise self.error
+
+
+def mock_get_by_token(statuses):
+    def mock_get(*args, headers=None, **kwargs):
+        token = headers['Authorization'].split()[1]
+        status = statuses[token]
+        if isinstance(status, Exception):
+            raise status
+        return MockResponse(status)
+    return mock_get
+
+
+class TestPreflight:
+
+    def test_run_preflight(self):
+        def broken():
+            raise ConnectionError('timeout')
+
+        assert run_preflight({
+            'ok': lambda: True, 'bad': lambda: False, 'unknown': broken
+        }, max_workers=2) == {'ok': True, 'bad': False, 'unknown': None}
+
+    def test_invalid_accounts_quarantined(self, monkeypatch, homework_module):
+        monkeypatch.setattr(requests, 'get', mock_get_by_token({
+            'good': HTTPStatus.OK,
+            'bad': HTTPStatus.UNAUTHORIZED,
+            'down': requests.ConnectionError('down'),
+        }))
+        accounts = [
+            Account('good', 'good'), Account('bad', 'bad'),
+            Account('down', 'down')
+        ]
+        homework_module.preflight(MockBot(), accounts)
+        assert [account.quarantined for account in accounts] == [
+            False, True, False
+        ], 'В карантин попадают только аккаунты с недействительным токеном.'
+
+    def test_invalid_telegram_token_stops_bot(self, monkeypatch,
+                                              homework_module):
+        monkeypatch.setattr(requests, 'get', mock_get_by_token({
+            'good': HTTPStatus.OK
+        }))
+        with pytest.raises(ValueError):
+            homework_module.preflight(
+                MockBot(telegram.error.Unauthorized('bad token')),
+                [Account('good', 'good')]
+            )
+
+    def test_all_accounts_invalid_stops_bot(self, monkeypatch,
+                                            homework_module):
+        monkeypatch.setattr(requests, 'get', mock_get_by_token({
+            'bad': HTTPStatus.UNAUTHORIZED
+        }))
+        with pytest.raises(ValueError):
+            homework_module.preflight(MockBot(), [Account('bad', 'bad')])
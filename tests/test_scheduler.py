@@ -0,0 +1,110 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bot.accounts import Account, account_state_file, load_accounts
+from bot.scheduler import CycleScheduler
+
+
+def make_account(name, status=None):
+    account = Account(name, f'token-{name}')
+    if status:
+        account.state.update({'homework_name': name, 'status': status})
+    return account
+
+
+class TestCycleScheduler:
+
+    def test_active_accounts_first(self):
+        idle = make_account('idle', 'approved')
+        active = make_account('active', 'reviewing')
+        quarantined = make_account('bad')
+        quarantined.quarantined = True
+        plan = CycleScheduler().plan([idle, active, quarantined])
+        assert [account.name for account in plan] == ['active', 'idle']
+
+    def test_overload_sheds_idle_accounts(self):
+        accounts = [
+            make_account('active', 'reviewing'), make_account('idle1'),
+            make_account('idle2')
+        ]
+        polled = []
+        scheduler = CycleScheduler(max_deferrals=2)
+        for _ in range(3):
+            scheduler.run(accounts, lambda item: polled.append(item.name), -1)
+        assert polled == ['active', 'active', 'idle1', 'idle2', 'active'], (
+            'При перегрузке опрашиваются активные аккаунты, а отложенные '
+            'не дольше `max_deferrals` циклов.'
+        )
+        assert scheduler.shed_total == 4 and scheduler.overruns == 3
+
+    def test_no_shedding_within_budget(self):
+        accounts = [make_account('a'), make_account('b')]
+        scheduler = CycleScheduler()
+        assert scheduler.run(accounts, lambda account: None, 60) == 0
+        assert scheduler.report()['overruns'] == 0
+
+
+class TestAccounts:
+
+    def test_load_accounts(self, tmp_path):
+        path = tmp_path / 'accounts.json'
+        path.write_text(json.dumps([
+            {'name': 'mentor', 'token': 'abc', 'subscribers': ['1:en', '2']}
+        ]))
+        account, = load_accounts(
+            str(path), lambda raw: raw.split(','), 'state.json'
+        )
+        assert account.headers == {'Authorization': 'OAuth abc'}
+        assert account.subscribers == ['1:en', '2']
+        assert account.state.path == 'state-mentor.json'
+        assert account_state_file(None, 'mentor') is None
+
+
+class TestPooledScheduler:
+
+    def test_results_processed_in_caller_thread(self):
+        accounts = [make_account(f'a{number}') for number in range(6)]
+        barrier = threading.Barrier(3, timeout=5)
+        processed = []
+
+        def fetch(account):
+            if account.name in ('a0', 'a1', 'a2'):
+                barrier.wait()
+            return account.name
+
+        def process(account, future):
+            processed.append((future.result(), threading.current_thread()))
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            shed = CycleScheduler().run_pooled(
+                accounts, fetch, process, 10, pool
+            )
+        assert shed == 0
+        assert sorted(name for name, _ in processed) == [
+            f'a{number}' for number in range(6)
+        ], 'Результаты всех аккаунтов должны вернуться в основной цикл.'
+        assert {thread for _, thread in processed} == {
+            threading.current_thread()
+        }
+
+    def test_pending_idle_accounts_cancelled_after_budget(self):
+        release = threading.Event()
+        accounts = [
+            make_account('active', 'reviewing'), make_account('idle')
+        ]
+        processed = []
+
+        def fetch(account):
+            release.wait(5)
+
+        def process(account, future):
+            processed.append(account.name)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            timer = threading.Timer(0.2, release.set)
+            timer.start()
+            scheduler = CycleScheduler()
+            shed = scheduler.run_pooled(accounts, fetch, process, 0.05, pool)
+        assert processed == ['active']
+        assert shed == 1 and accounts[1].deferred == 1
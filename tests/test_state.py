@@ -0,0 +1,43 @@
+from bot.state import HomeworkState
+
+
+class TestHomeworkState:
+    HOMEWORK = {
+        'id': 1,
+        'homework_name': 'hw123',
+        'status': 'reviewing',
+        'date_updated': '2020-02-13T14:40:57Z'
+    }
+
+    def test_update_detects_only_changes(self):
+        state = HomeworkState()
+        transition = state.update(self.HOMEWORK)
+        assert transition and transition.new_status == 'reviewing'
+        assert state.update(dict(self.HOMEWORK)) is None, (
+            'Повторный статус не должен считаться изменением.'
+        )
+        transition = state.update({**self.HOMEWORK, 'status': 'approved'})
+        assert transition.old_status == 'reviewing'
+        assert [item.new_status for item in state.history()] == [
+            'approved', 'reviewing'
+        ], 'История должна начинаться с самого нового изменения.'
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / 'state.json')
+        state = HomeworkState(path)
+        state.update(self.HOMEWORK)
+        state.save()
+        restored = HomeworkState(path)
+        restored.load()
+        assert restored.snapshot() == state.snapshot()
+        assert restored.history() == state.history()
+        assert restored.update(self.HOMEWORK) is None
+
+    def test_cursor_persisted(self, tmp_path):
+        path = str(tmp_path / 'state.json')
+        state = HomeworkState(path)
+        state.cursor = 1200
+        state.save()
+        restored = HomeworkState(path)
+        restored.load()
+        assert restored.cursor == 1200
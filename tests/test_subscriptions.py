@@ -0,0 +1,63 @@
+import telegram
+
+from bot.subscriptions import (
+    MAX_WORKERS, Broadcaster, Subscriber, parse_subscribers
+)
+
+
+class TestSubscriptions:
+
+    def test_parse_subscribers(self):
+        assert parse_subscribers(' 1:en, 2 ,,', 'ru') == [
+            Subscriber('1', 'en'), Subscriber('2', 'ru')
+        ]
+        assert parse_subscribers('', 'ru') == []
+
+    def test_broadcast_renders_once_per_locale(self):
+        rendered = []
+        sent = {}
+
+        def localize(message, locale):
+            rendered.append(locale)
+            return f'{message}:{locale}'
+
+        def send(chat_id, text):
+            sent[chat_id] = text
+
+        subscribers = [
+            Subscriber('1', 'ru'), Subscriber('2', 'en'), Subscriber('3', 'ru')
+        ]
+        result = Broadcaster().broadcast(send, subscribers, 'msg', localize)
+        assert result == {'1': True, '2': True, '3': True}
+        assert sorted(rendered) == ['en', 'ru'], (
+            'Сообщение должно готовиться один раз для каждой локали.'
+        )
+        assert sent == {'1': 'msg:ru', '2': 'msg:en', '3': 'msg:ru'}
+
+    def test_failure_tracked_per_recipient(self):
+        def send(chat_id, text):
+            if chat_id == '2':
+                raise ConnectionError('blocked')
+
+        broadcaster = Broadcaster()
+        subscribers = [Subscriber('1', 'ru'), Subscriber('2', 'ru')]
+        for _ in range(2):
+            result = broadcaster.broadcast(
+                send, subscribers, 'msg', lambda message, locale: message
+            )
+        assert result == {'1': True, '2': False}
+        assert broadcaster.recipients['1'].failures == 0
+        assert broadcaster.recipients['2'].failures == 2
+        assert broadcaster.recipients['2'].last_error == 'blocked'
+
+    def test_parse_subscriber_digest(self):
+        assert parse_subscribers('1::daily,2:en:hourly', 'ru') == [
+            Subscriber('1', 'ru', 'daily'), Subscriber('2', 'en', 'hourly')
+        ]
+
+    def test_bot_connection_pool_fits_broadcast(self, homework_module):
+        bot = telegram.Bot(token='1234:abcdefg')
+        homework_module.pool_connections(bot)
+        assert bot.request.con_pool_size > MAX_WORKERS, (
+            'Пул соединений бота должен вмещать все потоки рассылки.'
+        )
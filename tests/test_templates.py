@@ -0,0 +1,49 @@
+import pytest
+
+from bot.templates import MessageRenderer, StatusMessage
+
+
+class TestMessageRenderer:
+    VERDICTS = {
+        'ru': {'approved': 'Ура!', 'rejected': 'Есть замечания.'},
+        'en': {'approved': 'Hooray!'},
+    }
+
+    def test_render_default_locale(self):
+        renderer = MessageRenderer(self.VERDICTS)
+        assert renderer.render('ru', 'approved', 'hw{1}') == (
+            'Изменился статус проверки работы "hw{1}". Ура!'
+        ), 'Имя работы должно подставляться в шаблон без изменений.'
+
+    def test_render_unknown_locale_and_status_fallback(self):
+        renderer = MessageRenderer(self.VERDICTS)
+        assert renderer.render('de', 'approved', 'hw').endswith('Ура!'), (
+            'Для неизвестной локали используется локаль по умолчанию.'
+        )
+        assert renderer.render('en', 'rejected', 'hw').endswith(
+            'Есть замечания.'
+        ), 'Если в локали нет вердикта, берётся вердикт по умолчанию.'
+        with pytest.raises(KeyError):
+            renderer.render('ru', 'unknown', 'hw')
+
+    def test_render_cache_eviction(self):
+        renderer = MessageRenderer(self.VERDICTS, cache_size=2)
+        renderer.render('ru', 'approved', 'hw1')
+        renderer.render('ru', 'approved', 'hw2')
+        renderer.render('ru', 'approved', 'hw1')
+        renderer.render('ru', 'approved', 'hw3')
+        assert renderer.hits == 1 and renderer.misses == 3
+        renderer.render('ru', 'approved', 'hw2')
+        assert renderer.misses == 4, (
+            'Из кэша должна вытесняться давно не используемая запись.'
+        )
+
+    def test_localize_status_message(self):
+        renderer = MessageRenderer(self.VERDICTS)
+        message = StatusMessage('текст', 'approved', 'hw')
+        assert renderer.localize(message, 'en') == (
+            'Review status of "hw" has changed. Hooray!'
+        )
+        assert renderer.localize('Бот начал работу', 'en') == (
+            'Бот начал работу'
+        ), 'Обычные сообщения не переводятся.'
@@ -0,0 +1,115 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bot.lanes import DeliveryLane
+from bot.tracing import NOOP_SPAN, FileSpanExporter, Tracer
+
+
+class MemoryExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+class TestTracing:
+
+    def test_disabled_tracer_is_noop(self):
+        with Tracer().span('cycle') as span:
+            assert span is NOOP_SPAN
+
+    def test_nested_spans_and_errors(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+        with pytest.raises(ValueError):
+            with tracer.span('cycle', account='default') as cycle:
+                with tracer.span('get_api_answer') as child:
+                    child.set('homeworks', 2)
+                raise ValueError('boom')
+        child, cycle = exporter.spans
+        assert child.parent_id == cycle.span_id
+        assert child.trace_id == cycle.trace_id and len(cycle.trace_id) == 32
+        assert cycle.status == 2 and 'boom' in cycle.message
+        otlp = child.to_otlp()
+        assert otlp['attributes'] == [
+            {'key': 'homeworks', 'value': {'intValue': '2'}}
+        ]
+        assert int(otlp['endTimeUnixNano']) >= int(otlp['startTimeUnixNano'])
+
+    def test_file_exporter_writes_otlp_json(self, tmp_path):
+        path = tmp_path / 'spans.jsonl'
+        exporter = FileSpanExporter(str(path))
+        exporter.start()
+        with Tracer(exporter).span('cycle'):
+            pass
+        exporter.stop()
+        exporter.join(5)
+        request = json.loads(path.read_text().splitlines()[0])
+        spans = request['resourceSpans'][0]['scopeSpans'][0]['spans']
+        assert [span['name'] for span in spans] == ['cycle']
+
+    def test_span_attached_in_other_thread(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+        cycle = tracer.start('cycle')
+
+        def fetch():
+            with tracer.attach(cycle):
+                with tracer.span('get_api_answer'):
+                    pass
+
+        worker = threading.Thread(target=fetch)
+        worker.start()
+        worker.join(5)
+        with tracer.attach(cycle):
+            with tracer.span('process_homeworks'):
+                pass
+        assert tracer.current() is NOOP_SPAN
+        assert exporter.spans[-1].name == 'process_homeworks', (
+            'attach не должен завершать спан.'
+        )
+        tracer.finish(cycle)
+        fetched, processed, finished = exporter.spans
+        assert finished is cycle
+        assert fetched.parent_id == processed.parent_id == cycle.span_id
+        assert fetched.trace_id == processed.trace_id == cycle.trace_id
+
+    def test_pooled_cycle_shares_trace(
+            self, monkeypatch, homework_module, offline_poll):
+        exporter = MemoryExporter()
+        monkeypatch.setattr(homework_module, 'tracer', Tracer(exporter))
+        with ThreadPoolExecutor(2) as pool:
+            homework_module.poll_accounts(
+                offline_poll.sink, [offline_poll.account],
+                homework_module.RETRY_PERIOD, pool
+            )
+        spans = {span.name: span for span in exporter.spans}
+        cycle = spans['cycle']
+        assert {span.trace_id for span in exporter.spans} == {
+            cycle.trace_id
+        }, 'Все этапы цикла аккаунта должны быть в одной трассе.'
+        for name in ('get_api_answer', 'check_response', 'process_homeworks'):
+            assert spans[name].parent_id == cycle.span_id, name
+
+    def test_lane_send_stays_in_cycle_trace(
+            self, monkeypatch, homework_module, offline_poll):
+        exporter = MemoryExporter()
+        monkeypatch.setattr(homework_module, 'tracer', Tracer(exporter))
+        lane = DeliveryLane('traced')
+        monkeypatch.setattr(homework_module, 'notification_lane', lane)
+        lane.start()
+        try:
+            homework_module.run_cycle(offline_poll.sink, offline_poll.account)
+            assert lane.drain(timeout=2)
+        finally:
+            lane.stop()
+        spans = {span.name: span for span in exporter.spans}
+        send = spans['send_message']
+        assert send.trace_id == spans['cycle'].trace_id, (
+            'Отправка из полосы доставки должна быть в трассе цикла.'
+        )
+        assert send.parent_id == spans['process_homeworks'].span_id
@@ -0,0 +1,60 @@
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import requests
+from urllib3 import HTTPResponse
+
+from bot.transfer import TransferStats, response_sizes
+
+PAYLOAD = {'homeworks': [{'homework_name': 'hw', 'status': 'approved'}] * 50,
+           'current_date': 1}
+
+
+def make_gzip_response():
+    body = json.dumps(PAYLOAD).encode()
+    compressed = gzip.compress(body)
+    response = requests.Response()
+    response.status_code = HTTPStatus.OK
+    response.raw = HTTPResponse(
+        body=io.BytesIO(compressed),
+        headers={'Content-Encoding': 'gzip'},
+        preload_content=False
+    )
+    return response, len(compressed), len(body)
+
+
+class TestTransfer:
+
+    def test_response_sizes_counts_wire_bytes(self):
+        response, compressed, body = make_gzip_response()
+        response.content
+        assert response_sizes(response) == (compressed, body)
+
+    def test_stats_report(self):
+        stats = TransferStats()
+        stats.record('default', 100, 400, 0.5)
+        stats.record('default', 100, 400, 0.5)
+        assert stats.report() == {'default': {
+            'polls': 2, 'wire_bytes': 200, 'body_bytes': 800,
+            'decode_seconds': 1.0, 'compression_ratio': 4.0
+        }}
+
+    def test_request_statuses_accounting(self, monkeypatch, homework_module):
+        sent_headers = {}
+
+        def mock_get(*args, headers=None, **kwargs):
+            sent_headers.update(headers)
+            return make_gzip_response()[0]
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        monkeypatch.setattr(homework_module, 'transfer', TransferStats())
+        result = homework_module.request_statuses(
+            {'Authorization': 'OAuth token'}, 0, 'student'
+        )
+        assert result == PAYLOAD
+        assert 'gzip' in sent_headers['Accept-Encoding']
+        assert sent_headers['Authorization'] == 'OAuth token'
+        report = homework_module.transfer.report()['student']
+        assert report['polls'] == 1 and report['compression_ratio'] > 1
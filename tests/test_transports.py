@@ -0,0 +1,60 @@
+import json
+import queue
+
+import pytest
+import telegram
+
+from bot.accounts import Account
+from bot.transports import (
+    FileSink, InMemorySink, InMemoryStatusSource, NotificationSink,
+    QueueSink, StatusSource
+)
+
+
+class TestTransports:
+
+    def test_in_memory_source_filters_by_from_date(self):
+        source = InMemoryStatusSource()
+        account = Account('student', 'token')
+        source.put('student', [{'id': 1, 'status': 'reviewing'}], 100)
+        source.put('student', [{'id': 2, 'status': 'approved'}], 200)
+        response = source.fetch(account, 150)
+        assert response['homeworks'] == [{'id': 2, 'status': 'approved'}]
+        assert isinstance(response['current_date'], int)
+        assert source.calls == 1
+
+    def test_status_source_requires_fetch(self):
+        with pytest.raises(TypeError):
+            StatusSource()
+
+    def test_sinks_share_interface(self):
+        with pytest.raises(TypeError):
+            NotificationSink()
+        for sink in (InMemorySink, FileSink, QueueSink, telegram.Bot):
+            assert issubclass(sink, NotificationSink), sink
+
+    def test_sinks(self, tmp_path):
+        memory = InMemorySink(maxlen=1)
+        memory.send_message(chat_id=1, text='a')
+        memory.send_message(chat_id=2, text='b')
+        assert list(memory.messages) == [(2, 'b')] and memory.sent == 2
+
+        path = tmp_path / 'export.jsonl'
+        sink = FileSink(str(path))
+        sink.send_message(chat_id=1, text='Ура!')
+        sink.close()
+        record = json.loads(path.read_text(encoding='utf-8'))
+        assert (record['chat_id'], record['text']) == (1, 'Ура!')
+
+        messages = queue.Queue()
+        QueueSink(messages).send_message(chat_id=1, text='a')
+        assert messages.get_nowait() == (1, 'a')
+
+    def test_core_loop_without_network(self, homework_module, offline_poll):
+        homework_module.run_cycle(offline_poll.sink, offline_poll.account)
+        homework_module.run_cycle(offline_poll.sink, offline_poll.account)
+        assert list(offline_poll.sink.messages) == [(
+            '42', 'Изменился статус проверки работы "hw123". '
+            'Работа проверена: ревьюеру всё понравилось. Ура!'
+        )], 'Повторный цикл не должен присылать тот же статус.'
+        assert offline_poll.source.calls == 2